@@ -1,14 +1,42 @@
+from contextlib import asynccontextmanager
+
 from api.v1.router import api_router
+from core.config import settings
+from core.database import get_pool_stats
+from core.event_cache import event_cache
 from core.exceptions import setup_exception_handlers
-from core.middleware import RequestIDMiddleware
+from core.logger import get_logging_stats, shutdown_logging
+from core.metrics import metrics
+from core.middleware import ReadYourWritesMiddleware, RequestIDMiddleware
+from core.pagination import NEXT_CURSOR_HEADER
+from core.password import password_hasher
+from core.security import verified_token_cache
+from core.user_cache import user_cache
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
+from services.sse import (sse_broker_consumer, sse_connections, sse_event_log,
+                          sse_heartbeat)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    await sse_broker_consumer.start()
+    await sse_heartbeat.start()
+    yield
+    await sse_heartbeat.stop()
+    await sse_broker_consumer.stop()
+    await sse_event_log.close()
+    password_hasher.shutdown()
+    shutdown_logging()
+
 
 app = FastAPI(
     title="Calendar API",
     description="A REST API for calendar management with user authentication",
     version="1.0.0",
-    redoc_url=None
+    redoc_url=None,
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -17,15 +45,40 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+if settings.read_database_url:
+    app.add_middleware(ReadYourWritesMiddleware)
+
 app.add_middleware(RequestIDMiddleware)
 
 setup_exception_handlers(app)
 
 app.include_router(api_router, prefix="/v1")
 
+CACHE_COUNTERS = frozenset({"hits", "redis_hits", "misses", "invalidations"})
+
+metrics.register_stats("sse", lambda: [({}, sse_connections.get_stats())],
+                       counters={"messages_delivered", "messages_dropped",
+                                 "connections_overflowed"})
+metrics.register_stats("user_cache", lambda: [({}, user_cache.get_stats())],
+                       counters=CACHE_COUNTERS)
+metrics.register_stats("event_cache", lambda: [({}, event_cache.get_stats())],
+                       counters=CACHE_COUNTERS)
+metrics.register_stats("token_cache", lambda: [({}, verified_token_cache.get_stats())],
+                       counters=CACHE_COUNTERS)
+metrics.register_stats("log_queue", lambda: [({}, get_logging_stats())],
+                       counters={"dropped"})
+metrics.register_stats("db_pool", lambda: [
+    ({"pool": name}, stats) for name, stats in get_pool_stats().items()
+], counters={"timeouts"})
 
 @app.get("/")
 async def root():
     return {"message": "Calendar API is running!"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -3,7 +3,8 @@ from core.database import get_db
 from core.exceptions import CustomHTTPException, ErrorCode
 from core.redis_refresh_token_store import redis_refresh_token_store
 from core.security import (create_access_token, create_refresh_token,
-                           get_current_user, verify_token)
+                           get_current_user, get_current_user_for_read,
+                           verify_token)
 from crud.user import (authenticate_user, create_user, get_user_by_email,
                        get_user_by_id, get_user_by_username)
 from fastapi import APIRouter, Depends, Request, Response, status
@@ -85,7 +86,12 @@ async def token_refresh(
 
     token_data = verify_token(refresh_token, token_type="refresh")
 
-    if not await redis_refresh_token_store.is_token_valid(token_data.user_id, refresh_token):
+    # Rotate before anything else so a replayed or concurrently used token
+    # fails here; if the user turns out to be missing or inactive, the new
+    # token is never handed out and the session is effectively revoked.
+    new_refresh_token = create_refresh_token(data={"sub": token_data.user_id})
+    if not await redis_refresh_token_store.rotate_token(
+            token_data.user_id, refresh_token, new_refresh_token):
         raise CustomHTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             error_code=ErrorCode.AUTHENTICATION_ERROR,
@@ -108,9 +114,6 @@ async def token_refresh(
         )
 
     access_token = create_access_token(data={"sub": user.id})
-    new_refresh_token = create_refresh_token(data={"sub": user.id})
-
-    await redis_refresh_token_store.store_token(user.id, new_refresh_token)
 
     response.set_cookie(
         key="refresh_token",
@@ -129,7 +132,7 @@ async def token_refresh(
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(current_user: User = Depends(get_current_user_for_read)):
     return current_user
 
 
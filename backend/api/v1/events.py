@@ -2,22 +2,24 @@
 from datetime import datetime
 from typing import List, Optional
 
-from core.database import get_db
+from core.database import get_db, get_read_db, is_primary_session
+from core.event_cache import CachedEvent, event_cache
 from core.exceptions import CustomHTTPException, ErrorCode
-from core.security import get_current_user
-from crud.event import (add_event_participant, create_event, delete_event,
-                        get_event_by_id, get_user_events,
-                        get_user_participation, update_event,
+from core.pagination import (NEXT_CURSOR_HEADER, decode_event_cursor,
+                             encode_event_cursor)
+from core.responses import ModelResponse
+from core.security import get_current_user, get_current_user_for_read
+from crud.event import (create_event, delete_event, get_event_by_id,
+                        get_user_events, update_event,
                         update_event_participation)
-from crud.user import get_user_by_email
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Response, status
 from models.user import User
 from schemas.event import (EventCreate, EventInviteResponse, EventResponse,
                            EventUpdate)
 from services.sse import SSEEventType, send_event_notification
 from sqlalchemy.ext.asyncio import AsyncSession
 
-router = APIRouter()
+router = APIRouter(default_response_class=ModelResponse)
 
 
 @router.post("/", response_model=EventResponse, status_code=status.HTTP_201_CREATED)
@@ -27,60 +29,87 @@ async def create_new_event(
     db: AsyncSession = Depends(get_db)
 ):
     db_event = await create_event(db=db, event=event, creator_id=current_user.id)
-
-    if event.participant_emails:
-        for email in event.participant_emails:
-            participant = await get_user_by_email(db, email=email)
-            if participant and participant.id != current_user.id:
-                await add_event_participant(db, event_id=db_event.id, user_id=participant.id)
-
-    event_with_participants = await get_event_by_id(db, event_id=db_event.id)
-    return EventResponse.model_validate(event_with_participants)
+    return ModelResponse(EventResponse.model_validate(db_event),
+                         status_code=status.HTTP_201_CREATED)
 
 
 @router.get("/", response_model=List[EventResponse])
 async def get_events(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    overlap: bool = False,
+    current_user: User = Depends(get_current_user_for_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
+    after = None
+    if cursor:
+        try:
+            after = decode_event_cursor(cursor)
+        except ValueError as exc:
+            raise CustomHTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                error_code=ErrorCode.BAD_REQUEST,
+                detail="Invalid cursor"
+            ) from exc
+
     events = await get_user_events(
         db=db,
         user_id=current_user.id,
         skip=skip,
         limit=limit,
         start_date=start_date,
-        end_date=end_date
+        end_date=end_date,
+        after=after,
+        overlap=overlap
     )
-    return events
+
+    headers = {}
+    if len(events) == limit:
+        last_event = events[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_event_cursor(
+            last_event.start_time, last_event.id)
+
+    return ModelResponse(events, headers=headers)
 
 
 @router.get("/{event_id}", response_model=EventResponse)
 async def get_event(
     event_id: str,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_for_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    db_event = await get_event_by_id(db, event_id=event_id)
-    if not db_event:
-        raise CustomHTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            error_code=ErrorCode.EVENT_NOT_FOUND,
-            detail="Event not found"
+    cached = await event_cache.get(event_id)
+    if cached is None:
+        token = event_cache.fill_token()
+        db_event = await get_event_by_id(db, event_id=event_id)
+        if not db_event:
+            raise CustomHTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                error_code=ErrorCode.EVENT_NOT_FOUND,
+                detail="Event not found"
+            )
+
+        cached = CachedEvent(
+            member_ids=frozenset({db_event.creator_id}).union(
+                p.user_id for p in db_event.participants),
+            body=EventResponse.model_validate(db_event).model_dump_json().encode()
         )
+        # A lagging replica row would outlive the lag by the cache TTL,
+        # and be served to the writer ahead of read-your-writes.
+        if is_primary_session(db):
+            await event_cache.set(event_id, cached, token)
 
-    if (db_event.creator_id != current_user.id and
-            not any(p.user_id == current_user.id for p in db_event.participants)):
+    if current_user.id not in cached.member_ids:
         raise CustomHTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             error_code=ErrorCode.ACCESS_DENIED,
             detail="Access denied to this event"
         )
 
-    return db_event
+    return Response(content=cached.body, media_type=ModelResponse.media_type)
 
 
 @router.put("/{event_id}", response_model=EventResponse)
@@ -105,20 +134,19 @@ async def update_existing_event(
             detail="Only event creator can update the event"
         )
 
-    old_participants = {p.user.id for p in db_event.participants}
+    old_participants = {p.user_id for p in db_event.participants}
 
-    updated_event = await update_event(db=db, event_id=event_id, event_update=event_update)
-    event_response = EventResponse.model_validate(updated_event)
+    changes = await update_event(db=db, db_event=db_event, event_update=event_update)
+    event_response = EventResponse.model_validate(db_event)
 
-    new_participants = {p.user.id for p in event_response.participants}
-    new_participants.add(event_response.creator_id)
-    await send_event_notification(SSEEventType.EVENT_UPDATED, event_response, new_participants)
+    recipients = (old_participants - changes.removed) | changes.added
+    recipients.add(event_response.creator_id)
+    await send_event_notification(SSEEventType.EVENT_UPDATED, event_response, recipients)
 
-    removed_participants = old_participants - new_participants
-    if removed_participants:
-        await send_event_notification(SSEEventType.EVENT_DELETED, event_response, removed_participants)
+    if changes.removed:
+        await send_event_notification(SSEEventType.EVENT_DELETED, event_response, changes.removed)
 
-    return event_response
+    return ModelResponse(event_response)
 
 
 @router.delete("/{event_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -157,7 +185,15 @@ async def respond_to_event_invitation(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    participation = await get_user_participation(db, event_id=event_id, user_id=current_user.id)
+    db_event = await get_event_by_id(db, event_id=event_id)
+    participation = None
+    if db_event:
+        participation = await update_event_participation(
+            db=db,
+            event_id=event_id,
+            user_id=current_user.id,
+            status=response.status
+        )
     if not participation:
         raise CustomHTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -165,24 +201,11 @@ async def respond_to_event_invitation(
             detail="You are not invited to this event"
         )
 
-    await update_event_participation(
-        db=db,
-        event_id=event_id,
-        user_id=current_user.id,
-        status=response.status
-    )
-
-    updated_event = await get_event_by_id(db, event_id=event_id)
-    if not updated_event:
-        raise CustomHTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            error_code=ErrorCode.EVENT_NOT_FOUND,
-            detail="Event not found"
-        )
-
-    event_response = EventResponse.model_validate(updated_event)
-    event_users = {updated_event.creator_id}.union(
-        {p.user.id for p in updated_event.participants})
+    # The UPDATE ... RETURNING refreshed the participation row in place, so
+    # the event loaded above already reflects the new status.
+    event_response = EventResponse.model_validate(db_event)
+    event_users = {db_event.creator_id}.union(
+        {p.user.id for p in db_event.participants})
     await send_event_notification(SSEEventType.EVENT_RESPONSE_UPDATED, event_response, event_users)
 
-    return event_response
+    return ModelResponse(event_response)
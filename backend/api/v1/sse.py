@@ -1,46 +1,43 @@
-import asyncio
-import json
+from typing import Optional
 
 from core.logger import root_logger
 from core.security import get_current_user
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Header
 from fastapi.responses import StreamingResponse
 from models.user import User
-from services.sse import (SSEEventMessage, SSEEventType, add_connection,
-                          remove_connection)
+from services.sse import CONNECTED_FRAME, get_replay_frames, sse_connections
 
 router = APIRouter()
 
 
 @router.get("/events")
 async def subscribe_to_events(
-    request: Request,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID")
 ):
     async def event_stream():
-        connection_queue: asyncio.Queue[SSEEventMessage] = asyncio.Queue()
-        add_connection(current_user.id, connection_queue)
-
-        connected_payload = {"type": SSEEventType.CONNECTED.value}
-        yield f"data: {json.dumps(connected_payload)}\n\n"
+        connection = sse_connections.add(current_user.id)
 
         try:
-            while True:
-                if await request.is_disconnected():
-                    break
+            yield CONNECTED_FRAME
 
-                try:
-                    message = await asyncio.wait_for(connection_queue.get(), timeout=1.0)
-                    yield f"data: {json.dumps({"type": message["type"].value, "data": message["data"].model_dump(mode="json")})}\n\n"
+            for frame in await get_replay_frames(connection, last_event_id):
+                yield frame
 
-                except asyncio.TimeoutError:
-                    continue
+            # StreamingResponse listens on the ASGI receive channel and
+            # cancels this generator on http.disconnect, so the loop only
+            # wakes up for frames and heartbeats.
+            while True:
+                frame = await connection.get()
+                if frame is None:
+                    break
+                yield frame
 
         except Exception as e:  # pylint: disable=broad-exception-caught
             root_logger.error('SSE stream failed', extra={
                               'user_id': current_user.id, 'error': e})
         finally:
-            remove_connection(current_user.id)
+            sse_connections.remove(connection)
 
     return StreamingResponse(
         event_stream(),
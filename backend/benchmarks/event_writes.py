@@ -0,0 +1,87 @@
+"""Database round trips and latency of the event write endpoints.
+
+Calls the create / update / respond handlers directly against DATABASE_URL,
+counting statements and commits with core.database.QueryCounter, and exits
+non-zero if any path goes over its round-trip budget.
+
+    python -m benchmarks.event_writes --participants 5 --repeat 50
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import timedelta
+
+from api.v1.events import (create_new_event, respond_to_event_invitation,
+                           update_existing_event)
+from core.database import AsyncSessionLocal, QueryCounter
+from core.utils import generate_ulid, utc_now
+from crud.user import get_user_by_email
+from models.user import User
+from schemas.event import EventCreate, EventInviteResponse, EventUpdate
+from sqlalchemy import insert
+
+# get_event_by_id itself costs three statements (event + two selectinload hops).
+BUDGETS = {"create": 4, "update": 8, "respond": 5}
+
+
+async def seed(participants: int) -> list[User]:
+    emails = [f"writes-benchmark-{i}@example.com" for i in range(participants + 1)]
+    async with AsyncSessionLocal() as db:
+        users = []
+        for i, email in enumerate(emails):
+            user = await get_user_by_email(db, email=email)
+            if user is None:
+                await db.execute(insert(User).values(
+                    id=generate_ulid(), email=email, username=f"writesbenchmark{i}",
+                    hashed_password="!", first_name="Writes", last_name="Benchmark",
+                    is_active=True, created_at=utc_now()))
+                user = await get_user_by_email(db, email=email)
+            users.append(user)
+        await db.commit()
+        return users
+
+
+async def timed(label: str, results: dict, handler, **kwargs):
+    async with AsyncSessionLocal() as db:
+        start = time.perf_counter()
+        with QueryCounter() as queries:
+            value = await handler(db=db, **kwargs)
+        results.setdefault(label, []).append(
+            ((time.perf_counter() - start) * 1000, queries.count))
+        return value
+
+
+async def run(participants: int, repeat: int) -> int:
+    creator, *invited = await seed(participants)
+    emails = [user.email for user in invited]
+    start = utc_now() + timedelta(days=1)
+
+    results: dict = {}
+    for _ in range(repeat):
+        event = await timed("create", results, create_new_event, current_user=creator,
+                            event=EventCreate(title="Writes benchmark", start_time=start,
+                                              end_time=start + timedelta(hours=1),
+                                              participant_emails=emails))
+        await timed("update", results, update_existing_event, current_user=creator,
+                    event_id=event.id,
+                    event_update=EventUpdate(title="Updated", participant_emails=emails[1:]))
+        await timed("respond", results, respond_to_event_invitation, current_user=invited[-1],
+                    event_id=event.id, response=EventInviteResponse(status="accepted"))
+
+    over_budget = 0
+    for label, samples in results.items():
+        durations = sorted(duration for duration, _ in samples)
+        round_trips = max(count for _, count in samples)
+        print(f"{label:>8}: median {durations[len(durations) // 2]:.1f} ms, "
+              f"{round_trips} round trips (budget {BUDGETS[label]})")
+        over_budget += round_trips > BUDGETS[label]
+    return over_budget
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--participants", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    sys.exit(1 if asyncio.run(run(args.participants, args.repeat)) else 0)
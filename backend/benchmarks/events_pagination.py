@@ -0,0 +1,85 @@
+"""Deep-page latency of GET /v1/events: offset vs keyset (cursor) pagination.
+
+Seeds one user with --events events (once) and then times fetching the
+page at --depth with both strategies against DATABASE_URL.
+
+    python -m benchmarks.events_pagination --events 100000 --depth 50000
+"""
+import argparse
+import asyncio
+import time
+from datetime import timedelta
+
+from core.database import AsyncSessionLocal
+from core.utils import generate_ulid, utc_now
+from crud.event import get_user_events
+from models.event import Event
+from models.user import User
+from sqlalchemy import func, insert, select
+
+BENCHMARK_EMAIL = "pagination-benchmark@example.com"
+
+
+async def seed(events: int) -> str:
+    async with AsyncSessionLocal() as db:
+        user_id = await db.scalar(select(User.id).where(User.email == BENCHMARK_EMAIL))
+        if user_id is None:
+            user_id = generate_ulid()
+            await db.execute(insert(User).values(
+                id=user_id, email=BENCHMARK_EMAIL, username="paginationbenchmark",
+                hashed_password="!", first_name="Pagination", last_name="Benchmark",
+                is_active=True, created_at=utc_now()))
+
+        existing = await db.scalar(
+            select(func.count()).select_from(Event).where(Event.creator_id == user_id))
+        start = utc_now()
+        rows = [{
+            "id": generate_ulid(),
+            "title": f"Benchmark event {i}",
+            "start_time": start + timedelta(minutes=30 * i),
+            "end_time": start + timedelta(minutes=30 * i + 25),
+            "creator_id": user_id,
+            "created_at": start,
+        } for i in range(existing, events)]
+        for offset in range(0, len(rows), 5000):
+            await db.execute(insert(Event), rows[offset:offset + 5000])
+        await db.commit()
+        return user_id
+
+
+async def timed(label: str, repeat: int, **kwargs) -> None:
+    durations = []
+    for _ in range(repeat):
+        async with AsyncSessionLocal() as db:
+            start = time.perf_counter()
+            await get_user_events(db=db, **kwargs)
+            durations.append((time.perf_counter() - start) * 1000)
+    durations.sort()
+    print(f"{label:>8}: median {durations[len(durations) // 2]:.1f} ms, "
+          f"max {durations[-1]:.1f} ms over {repeat} runs")
+
+
+async def run(events: int, depth: int, limit: int, repeat: int) -> None:
+    user_id = await seed(events)
+
+    async with AsyncSessionLocal() as db:
+        boundary = (await db.execute(
+            select(Event.start_time, Event.id)
+            .where(Event.creator_id == user_id)
+            .order_by(Event.start_time, Event.id)
+            .offset(depth - 1).limit(1)
+        )).one()
+
+    await timed("offset", repeat, user_id=user_id, skip=depth, limit=limit)
+    await timed("cursor", repeat, user_id=user_id, limit=limit,
+                after=(boundary.start_time, boundary.id))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=100000)
+    parser.add_argument("--depth", type=int, default=50000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.events, args.depth, args.limit, args.repeat))
@@ -0,0 +1,53 @@
+"""Requests/second for GET /v1/events served in-process through the ASGI app.
+
+Uses the user seeded by benchmarks.events_visibility (bench-u1 by default),
+authenticates with a locally minted access token and keeps --concurrency
+requests in flight against DATABASE_URL.
+
+    python -m benchmarks.events_throughput --requests 2000 --limit 100
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+import httpx
+from api.main import app
+from core.logger import root_logger
+from core.security import create_access_token
+
+
+async def run(user_id: str, requests: int, concurrency: int, limit: int) -> None:
+    root_logger.setLevel(logging.WARNING)
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': user_id})}"}
+    url = f"/v1/events/?limit={limit}"
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app),
+                                 base_url="http://benchmark") as client:
+        response = await client.get(url, headers=headers)
+        response.raise_for_status()
+        print(f"{len(response.json())} events, {len(response.content):,} bytes per response")
+
+        remaining = requests
+
+        async def worker() -> None:
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                (await client.get(url, headers=headers)).raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    print(f"{requests / elapsed:,.0f} requests/s ({elapsed / requests * 1000:.2f} ms each)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--user-id", default="bench-u1")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(run(args.user_id, args.requests, args.concurrency, args.limit))
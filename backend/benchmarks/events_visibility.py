@@ -0,0 +1,111 @@
+"""Visibility query for GET /v1/events: OR/EXISTS predicate vs UNION.
+
+Seeds --users users and --events events (each with --invites participants)
+with generate_series, then times both strategies for a sample of users and
+writes EXPLAIN (ANALYZE, BUFFERS) snapshots for one of them.
+
+    python -m benchmarks.events_visibility --users 100000 --events 1000000
+"""
+import argparse
+import asyncio
+import random
+import time
+from pathlib import Path
+
+from core.database import AsyncSessionLocal, engine
+from crud.event import get_user_events, user_events_query
+from sqlalchemy import Select, text
+
+STRATEGIES = ("or", "union")
+
+SEED_SQL = (
+    """
+    INSERT INTO users (id, email, username, hashed_password, first_name,
+                       last_name, is_active, created_at)
+    SELECT 'bench-u' || g, 'bench-u' || g || '@example.com', 'benchu' || g,
+           '!', 'Bench', 'User', true, now()
+    FROM generate_series(1, :users) AS g
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    INSERT INTO events (id, title, start_time, end_time, creator_id, created_at)
+    SELECT 'bench-e' || g, 'Benchmark event ' || g,
+           now() + (g % 8760) * interval '1 hour',
+           now() + (g % 8760) * interval '1 hour' + interval '30 minutes',
+           'bench-u' || (1 + g % :users), now()
+    FROM generate_series(1, :events) AS g
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    INSERT INTO user_events (id, user_id, event_id, status, invited_at)
+    SELECT 'bench-ue' || g || '-' || i,
+           'bench-u' || (1 + (g + i * 7919) % :users),
+           'bench-e' || g, 'invited', now()
+    FROM generate_series(1, :events) AS g, generate_series(1, :invites) AS i
+    ON CONFLICT DO NOTHING
+    """,
+    "ANALYZE users",
+    "ANALYZE events",
+    "ANALYZE user_events",
+)
+
+
+async def seed(users: int, events: int, invites: int) -> None:
+    async with engine.begin() as conn:
+        for statement in SEED_SQL:
+            await conn.execute(text(statement), {"users": users, "events": events,
+                                                 "invites": invites})
+
+
+async def explain(query: Select) -> str:
+    async with engine.connect() as conn:
+        compiled = query.compile(dialect=conn.dialect)
+        params = []
+        for name in compiled.positiontup:
+            bind_type = compiled.binds[name].type.dialect_impl(conn.dialect)
+            processor = bind_type.bind_processor(conn.dialect)
+            value = compiled.params[name]
+            params.append(processor(value) if processor else value)
+        result = await conn.exec_driver_sql(
+            "EXPLAIN (ANALYZE, BUFFERS) " + compiled.string, tuple(params))
+        return "\n".join(row[0] for row in result)
+
+
+async def timed(strategy: str, user_ids: list[str], limit: int) -> None:
+    durations = []
+    for user_id in user_ids:
+        async with AsyncSessionLocal() as db:
+            start = time.perf_counter()
+            await get_user_events(db=db, user_id=user_id, limit=limit, strategy=strategy)
+            durations.append((time.perf_counter() - start) * 1000)
+    durations.sort()
+    print(f"{strategy:>6}: median {durations[len(durations) // 2]:.1f} ms, "
+          f"p95 {durations[int(len(durations) * 0.95)]:.1f} ms over {len(durations)} users")
+
+
+async def run(users: int, events: int, invites: int, samples: int, limit: int,
+              explain_dir: Path) -> None:
+    await seed(users, events, invites)
+
+    user_ids = [f"bench-u{random.randint(1, users)}" for _ in range(samples)]
+    for strategy in STRATEGIES:
+        await timed(strategy, user_ids, limit)
+
+    explain_dir.mkdir(parents=True, exist_ok=True)
+    for strategy in STRATEGIES:
+        plan = await explain(user_events_query(user_ids[0], limit=limit, strategy=strategy))
+        (explain_dir / f"events_visibility_{strategy}.txt").write_text(plan + "\n")
+        print(f"\n-- {strategy} --\n{plan}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--events", type=int, default=1000000)
+    parser.add_argument("--invites", type=int, default=3)
+    parser.add_argument("--samples", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--explain-dir", type=Path, default=Path("benchmarks/explain"))
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.events, args.invites, args.samples, args.limit,
+                    args.explain_dir))
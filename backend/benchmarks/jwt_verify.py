@@ -0,0 +1,45 @@
+"""Access-token verification throughput per JWT backend, with and without
+the verified-token cache in core.security.
+
+    python -m benchmarks.jwt_verify --iterations 20000
+"""
+import argparse
+import time
+
+from core.jwt_backend import JWT_BACKENDS
+from core.security import VerifiedTokenCache, create_access_token
+
+
+def report(name: str, iterations: int, elapsed: float) -> None:
+    print(f"{name:>16}: {iterations / elapsed:>10,.0f} verifications/s "
+          f"({elapsed / iterations * 1e6:.1f} us each)")
+
+
+def run(iterations: int) -> None:
+    token = create_access_token(data={"sub": "01JBENCHMARKUSER000000000"})
+
+    for name, backend_class in JWT_BACKENDS.items():
+        try:
+            backend = backend_class()
+        except RuntimeError as e:
+            print(f"{name:>16}: skipped ({e})")
+            continue
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            backend.decode(token)
+        report(name, iterations, time.perf_counter() - start)
+
+        cache = VerifiedTokenCache()
+        start = time.perf_counter()
+        for _ in range(iterations):
+            if cache.get(token) is None:
+                cache.put(token, backend.decode(token))
+        report(f"{name} + cache", iterations, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+    run(args.iterations)
@@ -0,0 +1,55 @@
+"""Records/second through core.logger.JSONFormatter with each JSON backend,
+for the request/response records RequestIDMiddleware emits and for an error
+record carrying a traceback and a non-serializable extra.
+
+Formatting only; no handler or stream is involved.
+
+    python -m benchmarks.log_formatter --records 100000
+"""
+import argparse
+import logging
+import sys
+import time
+
+from core.logger import JSONFormatter, orjson
+
+
+def make_records() -> dict[str, logging.LogRecord]:
+    response = logging.makeLogRecord({
+        "name": "calendar-api", "levelno": logging.INFO, "levelname": "INFO",
+        "msg": "response", "method": "GET", "endpoint": "/v1/events/",
+        "status_code": 200, "response_time_ms": 3.14, "response_size": 2048,
+        "db_queries": 2,
+    })
+    try:
+        raise ConnectionResetError("client went away")
+    except ConnectionResetError as e:
+        error = logging.makeLogRecord({
+            "name": "calendar-api", "levelno": logging.ERROR, "levelname": "ERROR",
+            "msg": "SSE stream failed", "user_id": "01JBENCHMARKUSER000000000",
+            "error": e, "exc_info": sys.exc_info(),
+        })
+    return {"response": response, "error": error}
+
+
+def run(records: int) -> None:
+    backends = {"json": JSONFormatter(use_orjson=False)}
+    if orjson is not None:
+        backends["orjson"] = JSONFormatter(use_orjson=True)
+
+    for record_name, record in make_records().items():
+        for backend_name, formatter in backends.items():
+            formatter.format(record)  # first record imports core.middleware
+            start = time.perf_counter()
+            for _ in range(records):
+                formatter.format(record)
+            elapsed = time.perf_counter() - start
+            print(f"{record_name:>8} / {backend_name:<6}: {records / elapsed:>10,.0f} records/s "
+                  f"({elapsed / records * 1e6:.1f} us each)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=100000)
+    args = parser.parse_args()
+    run(args.records)
@@ -0,0 +1,72 @@
+"""Requests/second through core.middleware.RequestIDMiddleware versus the
+same app with no middleware, for a small JSON response and a streamed one.
+
+Runs in-process over httpx's ASGI transport, so only middleware overhead is
+measured. Request/response log lines are filtered by level (WARNING) so the
+numbers are not dominated by stdout.
+
+    python -m benchmarks.middleware_throughput --requests 5000
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+import httpx
+from core.logger import root_logger
+from core.middleware import RequestIDMiddleware
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+
+def create_app(with_middleware: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/json")
+    async def json_endpoint():
+        return {"message": "Calendar API is running!"}
+
+    @app.get("/stream")
+    async def stream_endpoint():
+        async def chunks():
+            for _ in range(10):
+                yield b"data: benchmark\n\n"
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    if with_middleware:
+        app.add_middleware(RequestIDMiddleware)
+    return app
+
+
+async def measure(app: FastAPI, path: str, requests: int, concurrency: int) -> float:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app),
+                                 base_url="http://benchmark") as client:
+        remaining = requests
+
+        async def worker() -> None:
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                (await client.get(path)).raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - start)
+
+
+async def run(requests: int, concurrency: int) -> None:
+    root_logger.setLevel(logging.WARNING)
+    for path in ("/json", "/stream"):
+        baseline = await measure(create_app(False), path, requests, concurrency)
+        wrapped = await measure(create_app(True), path, requests, concurrency)
+        print(f"{path:>8}: {baseline:>8,.0f} req/s without middleware, "
+              f"{wrapped:>8,.0f} req/s with RequestIDMiddleware "
+              f"({(1 - wrapped / baseline) * 100:.0f}% overhead)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.concurrency))
@@ -0,0 +1,64 @@
+"""Idle CPU cost of N open SSE connections.
+
+Compares the old per-connection polling loop (wait_for with a 1 second
+timeout) with the event-driven connection plus shared heartbeat.
+
+    python -m benchmarks.sse_idle --connections 10000 --seconds 10
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from core.logger import root_logger
+from services.sse import SSEConnectionRegistry, SSEHeartbeat
+
+
+async def polling_stream(queue: asyncio.Queue[bytes]) -> None:
+    while True:
+        try:
+            await asyncio.wait_for(queue.get(), timeout=1.0)
+        except asyncio.TimeoutError:
+            continue
+
+
+async def event_driven_stream(registry: SSEConnectionRegistry, user_id: str) -> None:
+    connection = registry.add(user_id)
+    while await connection.get() is not None:
+        pass
+
+
+async def measure(name: str, streams: list[asyncio.Task[None]], seconds: float) -> None:
+    await asyncio.sleep(0.5)
+    cpu_start = time.process_time()
+    await asyncio.sleep(seconds)
+    cpu_used = time.process_time() - cpu_start
+    print(f"{name:>14}: {len(streams)} connections, "
+          f"{cpu_used:.3f}s CPU over {seconds:.0f}s "
+          f"({cpu_used / seconds * 100:.1f}% of a core)")
+    for stream in streams:
+        stream.cancel()
+    await asyncio.gather(*streams, return_exceptions=True)
+
+
+async def run(connections: int, seconds: float, heartbeat: float) -> None:
+    root_logger.setLevel(logging.WARNING)
+    queues: list[asyncio.Queue[bytes]] = [asyncio.Queue() for _ in range(connections)]
+    await measure("polling", [asyncio.create_task(polling_stream(queue))
+                              for queue in queues], seconds)
+
+    registry = SSEConnectionRegistry()
+    sse_heartbeat = SSEHeartbeat(registry, heartbeat)
+    await sse_heartbeat.start()
+    await measure("event-driven", [asyncio.create_task(event_driven_stream(registry, str(i)))
+                                   for i in range(connections)], seconds)
+    await sse_heartbeat.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--connections", type=int, default=10000)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--heartbeat", type=float, default=15.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.connections, args.seconds, args.heartbeat))
@@ -1,18 +1,59 @@
+from typing import Dict, Optional
+
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     database_url: str
+    read_database_url: Optional[str] = None
+    read_your_writes_seconds: int = 5
     secret_key: str
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 1
     refresh_token_expire_days: int = 7
+    jwt_backend: str = "jose"
+    token_cache_max_size: int = 10000
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 32
     port: int = 8000
     db_port: int = 5432
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: int = 0
+    event_visibility_strategy: str = "union"
     redis_url: str = "redis://localhost:6379"
     redis_stream_name: str = "calendar:events"
+    sse_broker: str = "memory"
+    sse_stream_maxlen: int = 10000
+    sse_stream_block_ms: int = 5000
+    sse_broker_retry_seconds: float = 1.0
+    sse_queue_maxsize: int = 100
+    sse_overflow_policy: str = "drop_oldest"
+    sse_heartbeat_seconds: float = 15.0
+    sse_event_log: str = "memory"
+    sse_event_log_size: int = 100
+    sse_event_log_ttl_seconds: int = 3600
+    sse_event_log_max_users: int = 10000
+    user_cache_ttl_seconds: float = 30.0
+    user_cache_max_size: int = 10000
+    user_cache_redis: bool = False
+    user_cache_redis_ttl_seconds: int = 300
+    event_cache_ttl_seconds: float = 30.0
+    event_cache_max_size: int = 10000
+    event_cache_redis: bool = False
+    event_cache_redis_ttl_seconds: int = 300
     environment: str = "development"
     log_level: str = "debug"
+    log_queue_enabled: bool = True
+    log_queue_size: int = 10000
+    log_queue_drop_policy: str = "drop_new"
+    log_request_sample_rate: float = 1.0
+    log_request_sample_rates: Dict[str, float] = {}
+    log_slow_request_ms: float = 1000.0
 
     class Config:
         env_file = ".env"
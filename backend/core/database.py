@@ -1,31 +1,176 @@
-from sqlalchemy.ext.asyncio import (AsyncSession, async_sessionmaker,
-                                    create_async_engine)
+import time
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (AsyncEngine, AsyncSession,
+                                    async_sessionmaker, create_async_engine)
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from core.config import settings
+from core.metrics import Histogram
+from core.utils import json_loads
 
+READ_YOUR_WRITES_COOKIE = "read_your_writes"
 
-engine = create_async_engine(
-    settings.database_url,
-    echo=False,
-    connect_args={
-        "server_settings": {
-            "timezone": "UTC"
-        }
-    }
-)
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long each checkout waited for
+    a connection, so requests queueing on a saturated pool show up in
+    get_pool_stats instead of only as slow responses."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.wait_seconds = Histogram()
+        self.timeouts = 0
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.wait_seconds.observe(time.perf_counter() - start)
+
+
+def build_engine(database_url: str, **kwargs: Any) -> AsyncEngine:
+    server_settings = {"timezone": "UTC"}
+    if settings.db_statement_timeout_ms > 0:
+        server_settings["statement_timeout"] = str(settings.db_statement_timeout_ms)
+
+    return create_async_engine(
+        database_url,
+        echo=False,
+        json_deserializer=json_loads,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args={
+            "server_settings": server_settings
+        },
+        **kwargs
+    )
+
+
+engine = build_engine(settings.database_url)
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
     expire_on_commit=False
 )
 
+# Reads that can tolerate replication lag go to READ_DATABASE_URL when it is
+# set; without it the read engine and sessions are the primary ones.
+read_engine = engine
+ReadSessionLocal = AsyncSessionLocal
+if settings.read_database_url:
+    read_engine = build_engine(
+        settings.read_database_url,
+        execution_options={"postgresql_readonly": True}
+    )
+    ReadSessionLocal = async_sessionmaker(
+        read_engine,
+        class_=AsyncSession,
+        expire_on_commit=False
+    )
+
 Base = declarative_base()
 
 
+class QueryCounter:
+    """Counts database round trips (statements and commits) made while it is
+    active. RequestIDMiddleware opens one per request and logs the total."""
+
+    def __init__(self):
+        self.count = 0
+        self._token: Optional[Token[Optional["QueryCounter"]]] = None
+
+    def __enter__(self) -> "QueryCounter":
+        self._token = query_counter_context.set(self)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self._token is not None:
+            query_counter_context.reset(self._token)
+
+
+query_counter_context: ContextVar[Optional[QueryCounter]] = ContextVar(
+    'query_counter', default=None)
+
+
+def _count_round_trip(*_args: Any, **_kwargs: Any) -> None:
+    counter = query_counter_context.get()
+    if counter is not None:
+        counter.count += 1
+
+
+def get_engines() -> Dict[str, AsyncEngine]:
+    engines = {"primary": engine}
+    if read_engine is not engine:
+        engines["read"] = read_engine
+    return engines
+
+
+for _engine in get_engines().values():
+    event.listen(_engine.sync_engine, "before_cursor_execute", _count_round_trip)
+    event.listen(_engine.sync_engine, "commit", _count_round_trip)
+
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    stats = {}
+    for name, pool_engine in get_engines().items():
+        pool = pool_engine.sync_engine.pool
+        stats[name] = {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "timeouts": pool.timeouts,
+            "wait_seconds": pool.wait_seconds.snapshot(),
+        }
+    return stats
+
+
 async def get_db():
     async with AsyncSessionLocal() as session:
         try:
             yield session
         finally:
             await session.close()
+
+
+def wrote_recently(request: Request) -> bool:
+    """True while the read-your-writes cookie set by ReadYourWritesMiddleware
+    after this client's last successful write is still valid."""
+    try:
+        return float(request.cookies.get(READ_YOUR_WRITES_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def is_primary_session(session: AsyncSession) -> bool:
+    """False for sessions on the read replica, whose rows may lag behind
+    the primary and must not be cached."""
+    return session.bind is engine
+
+
+async def get_read_db(request: Request):
+    """Session for read-only routes: the read replica, unless the client
+    wrote recently and the replica may not have caught up yet."""
+    session_factory = ReadSessionLocal
+    if read_engine is not engine and wrote_recently(request):
+        session_factory = AsyncSessionLocal
+
+    async with session_factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
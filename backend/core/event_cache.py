@@ -0,0 +1,136 @@
+import time
+from collections import OrderedDict
+from typing import Dict, FrozenSet, NamedTuple, Optional, Tuple
+
+import redis.asyncio as redis
+from core.config import settings
+from core.logger import root_logger
+from redis.exceptions import RedisError
+
+
+class CachedEvent(NamedTuple):
+    """A serialized EventResponse plus the ids allowed to read it (creator
+    and participants), so access can be checked without decoding `body`."""
+    member_ids: FrozenSet[str]
+    body: bytes
+
+
+class EventCache:
+    """Read-through cache of encoded GET /v1/events/{id} responses: an
+    in-process TTL/LRU tier in front of an optional Redis tier. The crud
+    functions that change an event or its participants invalidate it on the
+    writing worker, and every worker invalidates it again when the change's
+    SSE notification reaches it through the broker.
+
+    A miss read before a concurrent write committed must not be stored
+    after that write's invalidation: take fill_token() before reading and
+    pass it to set(), which drops the entry if anything was invalidated in
+    between."""
+
+    def __init__(
+        self,
+        max_size: int = settings.event_cache_max_size,
+        ttl_seconds: float = settings.event_cache_ttl_seconds,
+        client: Optional[redis.Redis] = None,
+        redis_ttl_seconds: int = settings.event_cache_redis_ttl_seconds,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.client = client
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self.key_prefix = "event_cache"
+        self._entries: OrderedDict[str, Tuple[float, CachedEvent]] = OrderedDict()
+        self._generation = 0
+        self.stats: Dict[str, int] = {
+            "hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "invalidations": 0,
+        }
+
+    def _get_key(self, event_id: str) -> str:
+        return f"{self.key_prefix}:{event_id}"
+
+    def _store_local(self, event_id: str, entry: CachedEvent) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        self._entries[event_id] = (time.monotonic() + self.ttl_seconds, entry)
+        self._entries.move_to_end(event_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get(self, event_id: str) -> Optional[CachedEvent]:
+        local = self._entries.get(event_id)
+        if local is not None:
+            expires_at, entry = local
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(event_id)
+                self.stats["hits"] += 1
+                return entry
+            del self._entries[event_id]
+
+        if self.client is not None:
+            try:
+                raw = await self.client.hgetall(self._get_key(event_id))
+            except RedisError as e:
+                root_logger.warning("Event cache read failed", extra={
+                                    "event_id": event_id, "error": str(e)})
+                raw = None
+            if raw:
+                entry = CachedEvent(
+                    member_ids=frozenset(raw[b"member_ids"].decode().split(",")),
+                    body=raw[b"body"]
+                )
+                self._store_local(event_id, entry)
+                self.stats["redis_hits"] += 1
+                return entry
+
+        self.stats["misses"] += 1
+        return None
+
+    def fill_token(self) -> int:
+        return self._generation
+
+    async def set(self, event_id: str, entry: CachedEvent, token: int) -> None:
+        if token != self._generation:
+            # Something was invalidated since the caller read `entry`; it
+            # may predate that write.
+            return
+
+        self._store_local(event_id, entry)
+
+        if self.client is not None:
+            key = self._get_key(event_id)
+            try:
+                async with self.client.pipeline(transaction=True) as pipe:
+                    pipe.hset(key, mapping={
+                        "member_ids": ",".join(entry.member_ids),
+                        "body": entry.body,
+                    })
+                    pipe.expire(key, self.redis_ttl_seconds)
+                    await pipe.execute()
+            except RedisError as e:
+                root_logger.warning("Event cache write failed", extra={
+                                    "event_id": event_id, "error": str(e)})
+
+    async def invalidate(self, event_id: str) -> None:
+        self._entries.pop(event_id, None)
+        self._generation += 1
+        self.stats["invalidations"] += 1
+
+        if self.client is not None:
+            try:
+                await self.client.delete(self._get_key(event_id))
+            except RedisError as e:
+                root_logger.warning("Event cache invalidation failed", extra={
+                                    "event_id": event_id, "error": str(e)})
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, "size": len(self._entries)}
+
+
+# Responses are stored as raw bytes, so unlike the other Redis clients this
+# one does not decode replies.
+event_cache = EventCache(
+    client=redis.Redis.from_url(settings.redis_url) if settings.event_cache_redis else None
+)
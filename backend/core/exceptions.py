@@ -22,6 +22,7 @@ class ErrorCode(str, Enum):
     TOKEN_INVALID = "TOKEN_INVALID"
     EVENT_NOT_FOUND = "EVENT_NOT_FOUND"
     ACCESS_DENIED = "ACCESS_DENIED"
+    SERVICE_UNAVAILABLE = "SERVICE_UNAVAILABLE"
 
 
 class CustomHTTPException(HTTPException):
@@ -50,7 +51,8 @@ async def custom_http_exception_handler(request: Request, exc: CustomHTTPExcepti
                 "code": exc.error_code.value,
                 "message": exc.detail,
             }
-        }
+        },
+        headers=exc.headers
     )
 
 
@@ -67,7 +69,8 @@ async def generic_http_exception_handler(request: Request, exc: HTTPException):
                 "code": "HTTP_ERROR",
                 "message": exc.detail,
             }
-        }
+        },
+        headers=exc.headers
     )
 
 
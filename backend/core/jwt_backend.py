@@ -0,0 +1,66 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+
+from core.config import settings
+from jose import JWTError
+from jose import jwt as jose_jwt
+
+try:
+    import jwt as pyjwt
+except ImportError:
+    pyjwt = None
+
+
+class TokenDecodeError(Exception):
+    pass
+
+
+class JWTBackend(ABC):
+    def __init__(self, secret_key: str = settings.secret_key, algorithm: str = settings.algorithm):
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+
+    @abstractmethod
+    def encode(self, payload: Dict[str, Any]) -> str:
+        ...
+
+    @abstractmethod
+    def decode(self, token: str) -> Dict[str, Any]:
+        """Verify the signature and expiry. Raises TokenDecodeError."""
+
+
+class JoseJWTBackend(JWTBackend):
+    def encode(self, payload: Dict[str, Any]) -> str:
+        return jose_jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        try:
+            return jose_jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+        except JWTError as exc:
+            raise TokenDecodeError(str(exc)) from exc
+
+
+class PyJWTBackend(JWTBackend):
+    def __init__(self, secret_key: str = settings.secret_key, algorithm: str = settings.algorithm):
+        if pyjwt is None:
+            raise RuntimeError("PyJWT is not installed")
+        super().__init__(secret_key, algorithm)
+
+    def encode(self, payload: Dict[str, Any]) -> str:
+        return pyjwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        try:
+            return pyjwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+        except pyjwt.PyJWTError as exc:
+            raise TokenDecodeError(str(exc)) from exc
+
+
+JWT_BACKENDS = {
+    "jose": JoseJWTBackend,
+    "pyjwt": PyJWTBackend,
+}
+
+
+def create_jwt_backend() -> JWTBackend:
+    return JWT_BACKENDS[settings.jwt_backend]()
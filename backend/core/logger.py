@@ -1,13 +1,64 @@
+import atexit
 import json
 import logging
+import queue
 import sys
 from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Dict, Optional
+
+from .config import settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Every attribute a bare LogRecord carries, plus those set by formatters;
+# anything else on a record came from the `extra` argument.
+RESERVED_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+def _json_default(value: Any) -> str:
+    """Fallback for extras json cannot encode, such as exception objects."""
+    try:
+        return str(value)
+    except Exception:  # pylint: disable=broad-exception-caught
+        return f"<unserializable {type(value).__name__}>"
+
+
+# Built once: json.dumps with any non-default argument creates an encoder
+# per call.
+_json_encoder = json.JSONEncoder(default=_json_default)
+
+
+def _orjson_dumps(value: Dict[str, Any]) -> str:
+    try:
+        return orjson.dumps(value, default=_json_default).decode()
+    except TypeError:
+        # Integers beyond 64 bits and other values orjson rejects outright.
+        return _json_encoder.encode(value)
 
 
 class JSONFormatter(logging.Formatter):
+    def __init__(self, use_orjson: bool = orjson is not None):
+        super().__init__()
+        self.dumps: Callable[[Dict[str, Any]], str] = (
+            _orjson_dumps if use_orjson else
+            _json_encoder.encode)
+        self._get_request_id: Optional[Callable[[], str]] = None
+
+    def request_id(self) -> str:
+        # core.middleware imports this module, so resolve it on first use.
+        if self._get_request_id is None:
+            from .middleware import get_request_id  # pylint: disable=import-outside-toplevel
+            self._get_request_id = get_request_id
+        return self._get_request_id()
+
     def format(self, record: logging.LogRecord):
         log_entry = {
-            "timestamp": datetime.now(timezone.utc).isoformat() + "Z",
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat() + "Z",
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -16,13 +67,9 @@ class JSONFormatter(logging.Formatter):
             "line": record.lineno
         }
 
-        try:
-            from .middleware import get_request_id
-            request_id = get_request_id()
-            if request_id:
-                log_entry["request_id"] = request_id
-        except (ImportError, LookupError):
-            pass
+        request_id = self.request_id()
+        if request_id:
+            log_entry["request_id"] = request_id
 
         # Add exception info if present
         if record.exc_info:
@@ -30,18 +77,55 @@ class JSONFormatter(logging.Formatter):
 
         # Add extra fields from logging extra parameter
         for key, value in record.__dict__.items():
-            if key not in ['name', 'msg', 'args', 'levelname', 'levelno', 'pathname', 'filename',
-                           'module', 'lineno', 'funcName', 'created', 'msecs', 'relativeCreated',
-                           'thread', 'threadName', 'processName', 'process', 'getMessage', 'exc_info',
-                           'exc_text', 'stack_info', 'taskName']:
+            if key not in RESERVED_ATTRS:
                 log_entry[key] = value
 
-        return json.dumps(log_entry)
+        return self.dumps(log_entry)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """QueueHandler over a bounded queue that never blocks the caller. When
+    the queue is full a record is dropped and counted: the incoming one
+    ("drop_new") or the oldest queued one ("drop_oldest"). Records are
+    JSON-formatted here, on the logging thread, so request ids from
+    contextvars are captured; only the write happens on the listener."""
+
+    def __init__(self, maxsize: int, drop_policy: str = "drop_new"):
+        super().__init__(queue.Queue(maxsize))
+        self.drop_policy = drop_policy
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+
+        if self.drop_policy == "drop_oldest":
+            try:
+                self.queue.get_nowait()
+                self.queue.put_nowait(record)
+            except (queue.Empty, queue.Full):
+                pass
+        self.dropped += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"queued": self.queue.qsize(), "dropped": self.dropped}
+
+
+class DrainingQueueListener(QueueListener):
+    """Waits for room for the stop sentinel instead of failing on a full
+    queue, so stop() always flushes what was already queued."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
 
 
 def setup_logger(
     name: str = "calendar-api",
     level: str = "INFO",
+    queued: bool = settings.log_queue_enabled,
 ) -> logging.Logger:
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, level.upper()))
@@ -54,6 +138,24 @@ def setup_logger(
 
     formatter = JSONFormatter()
 
+    if queued:
+        # stdout writes can block on a slow consumer; do them on the
+        # listener thread instead of the event loop.
+        queue_handler = BoundedQueueHandler(
+            settings.log_queue_size, settings.log_queue_drop_policy)
+        queue_handler.setLevel(getattr(logging, level.upper()))
+        queue_handler.setFormatter(formatter)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+
+        global log_listener  # pylint: disable=global-statement
+        if log_listener is not None:
+            log_listener.stop()
+        log_listener = DrainingQueueListener(queue_handler.queue, handler)
+        log_listener.start()
+
+        logger.addHandler(queue_handler)
+        return logger
+
     handler.setFormatter(formatter)
 
     logger.addHandler(handler)
@@ -61,4 +163,22 @@ def setup_logger(
     return logger
 
 
+def shutdown_logging() -> None:
+    """Stops the queue listener after it has written every queued record."""
+    global log_listener  # pylint: disable=global-statement
+    if log_listener is not None:
+        log_listener.stop()
+        log_listener = None
+
+
+def get_logging_stats() -> Dict[str, int]:
+    for handler in root_logger.handlers:
+        if isinstance(handler, BoundedQueueHandler):
+            return handler.get_stats()
+    return {"queued": 0, "dropped": 0}
+
+
+log_listener: Optional[QueueListener] = None
+
 root_logger = setup_logger()
+atexit.register(shutdown_logging)
@@ -0,0 +1,129 @@
+from bisect import bisect_left
+from itertools import accumulate
+from typing import (AbstractSet, Any, Callable, Dict, Iterable, List, Mapping,
+                    Sequence, Tuple)
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram with Prometheus semantics: each bucket counts
+    observations less than or equal to its upper bound."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative = list(accumulate(self.counts))
+        return {
+            "buckets": {
+                **{str(bound): count for bound, count in zip(self.buckets, cumulative)},
+                "+Inf": self.count,
+            },
+            "sum": self.sum,
+            "count": self.count,
+        }
+
+
+StatsCollector = Callable[[], Iterable[Tuple[Dict[str, str], Mapping[str, Any]]]]
+
+
+def _format_labels(labels: Mapping[str, Any]) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (key, str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n"))
+        for key, value in labels.items()
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def _histogram_lines(name: str, labels: Mapping[str, Any], snapshot: Dict[str, Any]) -> List[str]:
+    lines = [
+        f"{name}_bucket{_format_labels({**labels, 'le': bound})} {count}"
+        for bound, count in snapshot["buckets"].items()
+    ]
+    lines.append(f"{name}_sum{_format_labels(labels)} {snapshot['sum']}")
+    lines.append(f"{name}_count{_format_labels(labels)} {snapshot['count']}")
+    return lines
+
+
+class MetricsRegistry:
+    """In-process metrics rendered in the Prometheus text format at /metrics.
+    Request metrics are recorded by RequestIDMiddleware; anything that
+    already keeps a get_stats() dict is exported through register_stats."""
+
+    def __init__(self):
+        self.request_seconds: Dict[Tuple[str, str], Histogram] = {}
+        self.responses_total: Dict[Tuple[str, str, int], int] = {}
+        self.in_flight = 0
+        self._collectors: List[Tuple[str, StatsCollector, AbstractSet[str]]] = []
+
+    def observe_request(self, method: str, route: str, status_code: int, seconds: float) -> None:
+        histogram = self.request_seconds.get((method, route))
+        if histogram is None:
+            histogram = self.request_seconds[(method, route)] = Histogram()
+        histogram.observe(seconds)
+
+        key = (method, route, status_code)
+        self.responses_total[key] = self.responses_total.get(key, 0) + 1
+
+    def register_stats(
+        self, prefix: str, collect: StatsCollector, counters: AbstractSet[str] = frozenset()
+    ) -> None:
+        """Export every numeric value of the (labels, stats) pairs returned
+        by `collect` as `<prefix>_<key>` gauges, except the monotonic keys in
+        `counters`, which become `<prefix>_<key>_total` counters; Histogram
+        snapshots are exported as histograms."""
+        self._collectors.append((prefix, collect, counters))
+
+    def render(self) -> str:
+        lines = [
+            "# TYPE http_request_duration_seconds histogram",
+            *(line
+              for (method, route), histogram in self.request_seconds.items()
+              for line in _histogram_lines("http_request_duration_seconds",
+                                           {"method": method, "route": route},
+                                           histogram.snapshot())),
+            "# TYPE http_responses_total counter",
+            *(f"http_responses_total"
+              f"{_format_labels({'method': method, 'route': route, 'status': status_code})} {count}"
+              for (method, route, status_code), count in self.responses_total.items()),
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+        ]
+
+        for prefix, collect, counters in self._collectors:
+            samples: Dict[Tuple[str, str], List[Tuple[Dict[str, str], Any]]] = {}
+            for labels, stats in collect():
+                for key, value in stats.items():
+                    if key in counters:
+                        metric = (f"{prefix}_{key}_total", "counter")
+                    elif isinstance(value, dict):
+                        metric = (f"{prefix}_{key}", "histogram")
+                    else:
+                        metric = (f"{prefix}_{key}", "gauge")
+                    samples.setdefault(metric, []).append((labels, value))
+
+            for (name, metric_type), values in samples.items():
+                is_histogram = metric_type == "histogram"
+                lines.append(f"# TYPE {name} {metric_type}")
+                for labels, value in values:
+                    if is_histogram:
+                        lines.extend(_histogram_lines(name, labels, value))
+                    else:
+                        lines.append(f"{name}{_format_labels(labels)} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
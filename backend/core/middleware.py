@@ -1,77 +1,195 @@
+import logging
+import random
 import time
 from contextvars import ContextVar
-from typing import Any, Callable
+from typing import Dict, Optional
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from .config import settings
+from .database import READ_YOUR_WRITES_COOKIE, QueryCounter
 from .logger import root_logger
+from .metrics import metrics
 from .utils import generate_ulid
 
 request_id_context: ContextVar[str] = ContextVar('request_id', default='')
 
+UNSAFE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+
+def route_template(scope: Scope) -> str:
+    """The matched route's path template (e.g. /v1/events/{event_id}), so
+    metrics are not labelled with every distinct event id."""
+    route = scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+
+class RequestLogSampler:
+    """Decides per request whether its request/response lines are logged.
+    The longest path prefix in `rates` sets the rate, otherwise
+    `default_rate`; e.g. {"/v1/sse/": 0.0, "/v1/events/": 0.1}. The path is
+    matched before routing so the request line can be skipped too."""
+
+    def __init__(self, default_rate: float = settings.log_request_sample_rate,
+                 rates: Optional[Dict[str, float]] = None):
+        self.default_rate = default_rate
+        if rates is None:
+            rates = settings.log_request_sample_rates
+        self.rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+
+    def sample(self, path: str) -> bool:
+        rate = self.default_rate
+        for prefix, prefix_rate in self.rates:
+            if path.startswith(prefix):
+                rate = prefix_rate
+                break
+        return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+
+
+class RequestIDMiddleware:
+    """Assigns each request a ULID (request_id_context, X-Request-ID), logs
+    the request and response, and records request metrics.
+
+    Plain ASGI rather than BaseHTTPMiddleware: the app runs in the caller's
+    task and response messages are passed straight through, so streaming
+    responses such as /v1/sse/events are not wrapped. The response size is
+    summed from the http.response.body messages actually sent.
+
+    Request logging is sampled by RequestLogSampler; 5xx responses and
+    those whose headers took longer than `slow_request_ms` (0 disables)
+    are always logged, at WARNING."""
+
+    def __init__(self, app: ASGIApp, sampler: Optional[RequestLogSampler] = None,
+                 slow_request_ms: float = settings.log_slow_request_ms):
+        self.app = app
+        self.sampler = sampler or RequestLogSampler()
+        self.slow_request_ms = slow_request_ms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: Callable[..., Any]) -> Response:
         request_id = generate_ulid()
 
         request_id_context.set(request_id)
 
-        request.state.request_id = request_id
+        scope.setdefault("state", {})["request_id"] = request_id
 
-        body_size = 0
-        if hasattr(request, 'headers') and 'content-length' in request.headers:
-            try:
-                body_size = int(request.headers['content-length'])
-            except (ValueError, KeyError):
-                body_size = 0
+        method = scope["method"]
+        endpoint = scope["path"]
+        sampled = root_logger.isEnabledFor(logging.INFO) and self.sampler.sample(endpoint)
 
+        metrics.in_flight += 1
         start_time = time.perf_counter()
-        root_logger.info("request", extra={
-            "method": request.method,
-            "endpoint": request.url.path,
-            "query_params": str(request.query_params) if request.query_params else None,
-            "client_ip": request.client.host if request.client else None,
-            "user_agent": request.headers.get("user-agent"),
-            "body_size": body_size
-        })
+        if sampled:
+            headers = Headers(scope=scope)
+            body_size = 0
+            if 'content-length' in headers:
+                try:
+                    body_size = int(headers['content-length'])
+                except ValueError:
+                    body_size = 0
+
+            client = scope.get("client")
+            root_logger.info("request", extra={
+                "method": method,
+                "endpoint": endpoint,
+                "query_params": scope["query_string"].decode("latin-1") or None,
+                "client_ip": client[0] if client else None,
+                "user_agent": headers.get("user-agent"),
+                "body_size": body_size
+            })
+
+        status_code = 500
+        response_size = 0
+        headers_sent_at = None
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code, response_size, headers_sent_at
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers_sent_at = time.perf_counter()
+                MutableHeaders(scope=message).append("X-Request-ID", request_id)
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
 
         try:
-            response = await call_next(request)
+            with QueryCounter() as queries:
+                await self.app(scope, receive, send_with_request_id)
 
             response_time_ms = round(
                 (time.perf_counter() - start_time) * 1000, 2)
 
-            response_size = 0
-            if hasattr(response, 'headers') and 'content-length' in response.headers:
-                try:
-                    response_size = int(response.headers['content-length'])
-                except (ValueError, KeyError):
-                    response_size = 0
-
-            root_logger.info("response", extra={
-                "method": request.method,
-                "endpoint": request.url.path,
-                "status_code": response.status_code,
-                "response_time_ms": response_time_ms,
-                "response_size": response_size
-            })
-
-            response.headers["X-Request-ID"] = request_id
-
-            return response
+            metrics.observe_request(method, route_template(scope),
+                                    status_code, response_time_ms / 1000)
+
+            # Judged on time to the response headers: streams such as
+            # /v1/sse/events start at once but stay open for minutes.
+            latency_ms = response_time_ms
+            if headers_sent_at is not None:
+                latency_ms = (headers_sent_at - start_time) * 1000
+            slow = 0 < self.slow_request_ms <= latency_ms
+            if status_code >= 500 or slow:
+                level = logging.WARNING
+            else:
+                level = logging.INFO if sampled else logging.NOTSET
+
+            if level and root_logger.isEnabledFor(level):
+                root_logger.log(level, "response", extra={
+                    "method": method,
+                    "endpoint": endpoint,
+                    "status_code": status_code,
+                    "response_time_ms": response_time_ms,
+                    "response_size": response_size,
+                    "db_queries": queries.count
+                })
 
         except Exception as exc:  # pylint: disable=broad-exception-caught
             response_time_ms = round(
                 (time.perf_counter() - start_time) * 1000, 2)
+            metrics.observe_request(method, route_template(scope),
+                                    500, response_time_ms / 1000)
             root_logger.error("Request failed with unhandled exception", extra={
-                "method": request.method,
-                "endpoint": request.url.path,
+                "method": method,
+                "endpoint": endpoint,
                 "error": str(exc),
                 "response_time_ms": response_time_ms
             }, exc_info=True)
             raise exc
 
+        finally:
+            metrics.in_flight -= 1
+
+
+class ReadYourWritesMiddleware:
+    """Sets a short-lived cookie on every successful write so get_read_db
+    keeps that client's reads on the primary until the replica has caught
+    up. Plain ASGI, so streaming responses pass through untouched."""
+
+    def __init__(self, app: ASGIApp, window_seconds: int = settings.read_your_writes_seconds):
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in UNSAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                expires_at = time.time() + self.window_seconds
+                MutableHeaders(scope=message).append(
+                    "set-cookie",
+                    f"{READ_YOUR_WRITES_COOKIE}={expires_at:.3f}; "
+                    f"Max-Age={self.window_seconds}; Path=/; HttpOnly; SameSite=lax"
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
 
 def get_request_id() -> str:
     return request_id_context.get()
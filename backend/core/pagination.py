@@ -0,0 +1,23 @@
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+EventCursor = Tuple[datetime, str]
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_event_cursor(start_time: datetime, event_id: str) -> str:
+    raw = json.dumps([start_time.isoformat(), event_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_event_cursor(cursor: str) -> EventCursor:
+    """Raises ValueError for anything that is not a cursor we issued."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        start_time, event_id = json.loads(raw)
+        return datetime.fromisoformat(start_time), str(event_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
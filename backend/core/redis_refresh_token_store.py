@@ -1,10 +1,31 @@
+import hashlib
 from typing import Optional
 
 import redis.asyncio as redis
 from core.config import settings
 
+# Compare-and-set in one round trip: replace the stored hash only if it
+# still matches the token being rotated. KEYS[1] is the user's key; ARGV is
+# old hash, new hash, ttl and the old raw token (accepted for tokens stored
+# before hashing was introduced).
+ROTATE_SCRIPT = """
+local current = redis.call("GET", KEYS[1])
+if current and (current == ARGV[1] or current == ARGV[4]) then
+    redis.call("SET", KEYS[1], ARGV[2], "EX", ARGV[3])
+    return 1
+end
+return 0
+"""
+
+
+def hash_token(refresh_token: str) -> str:
+    return hashlib.sha256(refresh_token.encode()).hexdigest()
+
 
 class RedisRefreshTokenStore:
+    """One live refresh token per user, stored as its SHA-256 hash so a
+    Redis dump does not leak usable tokens."""
+
     def __init__(self):
         self.client = redis.Redis.from_url(
             settings.redis_url,
@@ -14,15 +35,17 @@ class RedisRefreshTokenStore:
         self.key_prefix = "refresh_token"
         self.ttl_seconds = settings.refresh_token_expire_days * \
             24 * 60 * 60
+        self.rotate_script = self.client.register_script(ROTATE_SCRIPT)
 
     def _get_key(self, user_id: str) -> str:
         return f"{self.key_prefix}:{user_id}"
 
     async def store_token(self, user_id: str, refresh_token: str):
         key = self._get_key(user_id)
-        await self.client.setex(key, self.ttl_seconds, refresh_token)
+        await self.client.setex(key, self.ttl_seconds, hash_token(refresh_token))
 
     async def get_token(self, user_id: str) -> Optional[str]:
+        """The stored token hash, not the token itself."""
         key = self._get_key(user_id)
         token = await self.client.get(key)
         return token
@@ -33,7 +56,19 @@ class RedisRefreshTokenStore:
 
     async def is_token_valid(self, user_id: str, refresh_token: str) -> bool:
         stored_token = await self.get_token(user_id)
-        return stored_token is not None and stored_token == refresh_token
+        return stored_token is not None and stored_token == hash_token(refresh_token)
+
+    async def rotate_token(self, user_id: str, refresh_token: str, new_refresh_token: str) -> bool:
+        """Atomically replaces `refresh_token` with `new_refresh_token`.
+        Returns False if `refresh_token` is not the user's current token,
+        including when a concurrent refresh already rotated it."""
+        rotated = await self.rotate_script(
+            keys=[self._get_key(user_id)],
+            args=[hash_token(refresh_token), hash_token(new_refresh_token),
+                  self.ttl_seconds, refresh_token],
+            client=self.client,
+        )
+        return bool(rotated)
 
 
 redis_refresh_token_store = RedisRefreshTokenStore()
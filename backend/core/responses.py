@@ -0,0 +1,19 @@
+from typing import Any
+
+import pydantic_core
+from fastapi import Response
+
+
+class ModelResponse(Response):
+    """JSON response for content that is already validated: pydantic models,
+    lists of them or plain rows are encoded once, straight to bytes, by
+    pydantic-core.
+
+    Returning one from a handler skips FastAPI's second pass through
+    `response_model` (re-validation plus jsonable_encoder). Set it as the
+    router's `default_response_class` so the OpenAPI schema stays JSON."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return pydantic_core.to_json(content)
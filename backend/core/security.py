@@ -1,81 +1,130 @@
+import hashlib
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, Dict, Optional, Tuple
 
 from fastapi import Depends, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.config import settings
-from core.database import get_db
+from core.database import get_db, get_read_db
 from core.exceptions import CustomHTTPException, ErrorCode
+from core.jwt_backend import TokenDecodeError, create_jwt_backend
+from core.user_cache import user_cache
+from core.utils import generate_ulid
 from crud.user import get_user_by_id
 from schemas.auth import TokenData
 
 security = HTTPBearer()
 
 
+class VerifiedTokenCache:
+    """Maps the SHA-256 digest of an already verified token to its subject
+    and type until the token's own exp, so repeat requests with the same
+    token skip signature verification."""
+
+    def __init__(self, max_size: int = settings.token_cache_max_size):
+        self.max_size = max_size
+        self._entries: OrderedDict[bytes, Tuple[float, str, str]] = OrderedDict()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+    def get(self, token: str) -> Optional[Tuple[str, str]]:
+        digest = hashlib.sha256(token.encode()).digest()
+        entry = self._entries.get(digest)
+        if entry is not None:
+            expires_at, user_id, token_type = entry
+            if expires_at > time.time():
+                self._entries.move_to_end(digest)
+                self.stats["hits"] += 1
+                return user_id, token_type
+            del self._entries[digest]
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, token: str, payload: Dict[str, Any]) -> None:
+        expires_at = payload.get("exp")
+        if self.max_size <= 0 or expires_at is None or payload.get("sub") is None:
+            return
+        digest = hashlib.sha256(token.encode()).digest()
+        self._entries[digest] = (float(expires_at), payload["sub"], payload.get("type"))
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, "size": len(self._entries)}
+
+
+jwt_backend = create_jwt_backend()
+verified_token_cache = VerifiedTokenCache()
+
+
 def create_access_token(data: dict[str, Any]):
     expire = datetime.now(timezone.utc) + \
         timedelta(minutes=settings.access_token_expire_minutes)
-    return jwt.encode({
+    return jwt_backend.encode({
         **data,
         "exp": expire,
-        "type": "access"},
-        settings.secret_key,
-        algorithm=settings.algorithm)
+        "type": "access"})
 
 
 def create_refresh_token(data: dict[str, Any]):
     expire = datetime.now(timezone.utc) + \
         timedelta(days=settings.refresh_token_expire_days)
-    return jwt.encode({
+    # jti keeps tokens minted in the same second distinct, which rotation
+    # relies on.
+    return jwt_backend.encode({
         **data,
         "exp": expire,
-        "type": "refresh"},
-        settings.secret_key,
-        algorithm=settings.algorithm)
+        "type": "refresh",
+        "jti": generate_ulid()})
 
 
 def verify_token(token: str, token_type: str = "access") -> TokenData:
-    try:
-        payload = jwt.decode(token, settings.secret_key,
-                             algorithms=[settings.algorithm])
-        user_id = payload.get("sub")
-
-        if user_id is None:
+    cached = verified_token_cache.get(token)
+    if cached is None:
+        try:
+            payload = jwt_backend.decode(token)
+        except TokenDecodeError as exc:
             raise CustomHTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 error_code=ErrorCode.TOKEN_INVALID,
-                detail="Invalid token"
-            )
+                detail="Could not validate credentials"
+            ) from exc
+        verified_token_cache.put(token, payload)
+        cached = payload.get("sub"), payload.get("type")
 
-        token_type_from_payload = payload.get("type")
-        if token_type_from_payload != token_type:
-            raise CustomHTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                error_code=ErrorCode.TOKEN_INVALID,
-                detail=f"Invalid token type. Expected {token_type}"
-            )
+    user_id, token_type_from_payload = cached
 
-        token_data = TokenData(user_id=user_id)
-        return token_data
-    except JWTError as exc:
+    if user_id is None:
         raise CustomHTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             error_code=ErrorCode.TOKEN_INVALID,
-            detail="Could not validate credentials"
-        ) from exc
+            detail="Invalid token"
+        )
 
+    if token_type_from_payload != token_type:
+        raise CustomHTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            error_code=ErrorCode.TOKEN_INVALID,
+            detail=f"Invalid token type. Expected {token_type}"
+        )
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db)
-):
-    token = credentials.credentials
+    token_data = TokenData(user_id=user_id)
+    return token_data
+
+
+async def _authenticate(token: str, db: AsyncSession):
     token_data = verify_token(token)
 
-    user = await get_user_by_id(db, user_id=token_data.user_id)
+    user = await user_cache.get(token_data.user_id)
+    if user is None:
+        user = await get_user_by_id(db, user_id=token_data.user_id)
+        if user is not None:
+            await user_cache.set(user)
+
     if user is None:
         raise CustomHTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -91,3 +140,19 @@ async def get_current_user(
         )
 
     return user
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db)
+):
+    return await _authenticate(credentials.credentials, db)
+
+
+async def get_current_user_for_read(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """get_current_user for read-only routes: on a user cache miss the user
+    is loaded through get_read_db, sharing the route's read session."""
+    return await _authenticate(credentials.credentials, db)
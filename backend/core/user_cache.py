@@ -0,0 +1,119 @@
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import redis.asyncio as redis
+from core.config import settings
+from core.logger import root_logger
+from models.user import User
+from redis.exceptions import RedisError
+
+CACHED_FIELDS = ("id", "email", "username", "first_name", "last_name",
+                 "is_active", "created_at", "updated_at")
+DATETIME_FIELDS = ("created_at", "updated_at")
+
+
+class UserCache:
+    """Authenticated-user cache for get_current_user: an in-process TTL/LRU
+    tier in front of an optional Redis tier. Password hashes are never
+    cached, and callers get a fresh detached User on every hit."""
+
+    def __init__(
+        self,
+        max_size: int = settings.user_cache_max_size,
+        ttl_seconds: float = settings.user_cache_ttl_seconds,
+        client: Optional[redis.Redis] = None,
+        redis_ttl_seconds: int = settings.user_cache_redis_ttl_seconds,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.client = client
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self.key_prefix = "user_cache"
+        self._entries: OrderedDict[str, Tuple[float, Dict[str, Any]]] = OrderedDict()
+        self.stats: Dict[str, int] = {
+            "hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "invalidations": 0,
+        }
+
+    def _get_key(self, user_id: str) -> str:
+        return f"{self.key_prefix}:{user_id}"
+
+    def _store_local(self, user_id: str, data: Dict[str, Any]) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        self._entries[user_id] = (time.monotonic() + self.ttl_seconds, data)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get(self, user_id: str) -> Optional[User]:
+        entry = self._entries.get(user_id)
+        if entry is not None:
+            expires_at, data = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(user_id)
+                self.stats["hits"] += 1
+                return User(**data)
+            del self._entries[user_id]
+
+        if self.client is not None:
+            try:
+                raw = await self.client.get(self._get_key(user_id))
+            except RedisError as e:
+                root_logger.warning("User cache read failed", extra={
+                                    "user_id": user_id, "error": str(e)})
+                raw = None
+            if raw is not None:
+                data = json.loads(raw)
+                for field in DATETIME_FIELDS:
+                    if data[field] is not None:
+                        data[field] = datetime.fromisoformat(data[field])
+                self._store_local(user_id, data)
+                self.stats["redis_hits"] += 1
+                return User(**data)
+
+        self.stats["misses"] += 1
+        return None
+
+    async def set(self, user: User) -> None:
+        data = {field: getattr(user, field) for field in CACHED_FIELDS}
+        self._store_local(user.id, data)
+
+        if self.client is not None:
+            try:
+                await self.client.setex(
+                    self._get_key(user.id),
+                    self.redis_ttl_seconds,
+                    json.dumps(data, default=datetime.isoformat)
+                )
+            except RedisError as e:
+                root_logger.warning("User cache write failed", extra={
+                                    "user_id": user.id, "error": str(e)})
+
+    async def invalidate(self, user_id: str) -> None:
+        self._entries.pop(user_id, None)
+        self.stats["invalidations"] += 1
+
+        if self.client is not None:
+            try:
+                await self.client.delete(self._get_key(user_id))
+            except RedisError as e:
+                root_logger.warning("User cache invalidation failed", extra={
+                                    "user_id": user_id, "error": str(e)})
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, "size": len(self._entries)}
+
+
+user_cache = UserCache(
+    client=redis.Redis.from_url(
+        settings.redis_url,
+        encoding="utf-8",
+        decode_responses=True
+    ) if settings.user_cache_redis else None
+)
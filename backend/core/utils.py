@@ -1,6 +1,14 @@
+import json
 from datetime import datetime, timezone
+from typing import Any
+
 from ulid import ULID
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def generate_ulid() -> str:
     return str(ULID())
@@ -8,3 +16,17 @@ def generate_ulid() -> str:
 
 def utc_now() -> datetime:
     return datetime.now(timezone.utc)
+
+
+def json_dumps(value: Any) -> bytes:
+    """Encode JSON-compatible data to compact bytes, using orjson when it is
+    installed."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+def json_loads(value: str | bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(value)
+    return json.loads(value)
@@ -1,13 +1,16 @@
-from .event import (add_event_participant, create_event, delete_event,
-                    get_event_by_id, get_user_events, get_user_participation,
-                    update_event, update_event_participation)
+from .event import (add_event_participant, add_event_participants,
+                    create_event, delete_event, get_event_by_id,
+                    get_user_events, get_user_participation, update_event,
+                    update_event_participation)
 from .user import (authenticate_user, create_user, get_user_by_email,
-                   get_user_by_id, get_user_by_username)
+                   get_user_by_id, get_user_by_username, get_users_by_emails)
 
 __all__ = [
     "get_user_by_id", "get_user_by_email", "get_user_by_username",
+    "get_users_by_emails",
     "create_user", "authenticate_user",
     "create_event", "get_event_by_id", "get_user_events",
     "update_event", "delete_event", "add_event_participant",
+    "add_event_participants",
     "update_event_participation", "get_user_participation"
 ]
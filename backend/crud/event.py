@@ -1,14 +1,34 @@
-import asyncio
 import datetime
-from typing import Optional, Sequence
+from typing import Any, Iterable, NamedTuple, Optional
 
-from crud.user import get_user_by_email
+from core.config import settings
+from core.event_cache import event_cache
+from core.pagination import EventCursor
+from core.utils import generate_ulid, utc_now
+from crud.user import get_users_by_emails
 from models.event import Event
+from models.user import User
 from models.user_event import UserEvent
-from schemas.event import EventCreate, EventUpdate
-from sqlalchemy import and_, delete, or_, select
+from schemas.event import EventCreate, EventResponse, EventUpdate
+from sqlalchemy import (JSON, ColumnElement, ScalarSelect, Select, String, all_,
+                        and_, bindparam, delete, false, func, literal_column,
+                        or_, select, tuple_, union, update)
+from sqlalchemy.dialects.postgresql import ARRAY, Range, aggregate_order_by
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+
+
+EVENT_RESPONSE_COLUMNS = (
+    Event.id, Event.title, Event.description, Event.start_time, Event.end_time,
+    Event.location, Event.creator_id, Event.created_at, Event.updated_at,
+)
+
+
+class ParticipantChanges(NamedTuple):
+    added: set[str]
+    removed: set[str]
 
 
 async def create_event(db: AsyncSession, event: EventCreate, creator_id: str) -> Event:
@@ -21,8 +41,20 @@ async def create_event(db: AsyncSession, event: EventCreate, creator_id: str) ->
         creator_id=creator_id,
     )
     db.add(db_event)
+    await db.flush()
+
+    participants: list[UserEvent] = []
+    if event.participant_emails:
+        users = await get_users_by_emails(db, event.participant_emails)
+        participants = await add_event_participants(
+            db, event_id=db_event.id,
+            users=[user for user in users if user.id != creator_id])
+
+    # Everything the response needs is already in hand; fill the collection
+    # directly instead of refreshing and re-selecting the event.
+    set_committed_value(db_event, "participants", participants)
+
     await db.commit()
-    await db.refresh(db_event)
     return db_event
 
 
@@ -35,57 +67,150 @@ async def get_event_by_id(db: AsyncSession, event_id: str) -> Optional[Event]:
     return result.scalar_one_or_none()
 
 
-async def get_user_events(
-    db: AsyncSession,
+def _visible_events_or(user_id: str, filters: list[ColumnElement[bool]]) -> Select[tuple[Event]]:
+    return select(Event).where(
+        or_(
+            Event.creator_id == user_id,
+            Event.participants.any(UserEvent.user_id == user_id),
+        ),
+        *filters
+    )
+
+
+def _visible_events_union(
+    user_id: str, filters: list[ColumnElement[bool]], branch_limit: int
+) -> Select[tuple[Event]]:
+    # Each branch can walk its own index (creator_id, start_time) or
+    # (user_id, ...) and stop after branch_limit rows; only the small union
+    # is joined back to events.
+    created = (
+        select(Event.id)
+        .where(Event.creator_id == user_id, *filters)
+        .order_by(Event.start_time, Event.id)
+        .limit(branch_limit)
+    )
+    invited = (
+        select(Event.id)
+        .join(UserEvent, UserEvent.event_id == Event.id)
+        .where(UserEvent.user_id == user_id, *filters)
+        .order_by(Event.start_time, Event.id)
+        .limit(branch_limit)
+    )
+    visible = union(created, invited).subquery()
+    return select(Event).join(visible, visible.c.id == Event.id)
+
+
+def user_events_query(
     user_id: str,
     skip: int = 0,
     limit: int = 100,
     start_date: Optional[datetime.datetime] = None,
     end_date: Optional[datetime.datetime] = None,
-) -> Sequence[Event]:
-    query = (
-        select(Event)
-        .options(selectinload(Event.participants).selectinload(UserEvent.user))
-        .where(
-            or_(
-                Event.creator_id == user_id,
-                Event.participants.any(UserEvent.user_id == user_id),
-            )
-        )
+    after: Optional[EventCursor] = None,
+    strategy: Optional[str] = None,
+    overlap: bool = False,
+) -> Select[tuple[Event]]:
+    filters: list[ColumnElement[bool]] = []
+    if overlap:
+        if start_date and end_date and start_date > end_date:
+            # Postgres rejects an inverted range; match the plain filters,
+            # which simply match nothing.
+            filters.append(false())
+        elif start_date or end_date:
+            # Served by the GiST index on the generated time_range column.
+            filters.append(Event.time_range.overlaps(
+                Range(start_date, end_date, bounds="[)")))
+    else:
+        if start_date:
+            filters.append(Event.start_time >= start_date)
+        if end_date:
+            filters.append(Event.end_time <= end_date)
+    if after:
+        # Keyset pagination: continue strictly after the last (start_time, id)
+        # seen instead of scanning and discarding `skip` rows.
+        filters.append(tuple_(Event.start_time, Event.id) > after)
+        skip = 0
+
+    if (strategy or settings.event_visibility_strategy) == "or":
+        query = _visible_events_or(user_id, filters)
+    else:
+        query = _visible_events_union(user_id, filters, skip + limit)
+
+    return query.order_by(Event.start_time, Event.id).offset(skip).limit(limit)
+
+
+def _participants_json(event_id: ColumnElement[str]) -> ScalarSelect[Any]:
+    """Participants of one event as a JSON array shaped like
+    List[ParticipantResponse], built in SQL from only the columns it needs."""
+    participant = func.json_build_object(
+        "user", func.json_build_object(
+            "id", User.id,
+            "email", User.email,
+            "username", User.username,
+            "first_name", User.first_name,
+            "last_name", User.last_name,
+        ),
+        "status", UserEvent.status,
+        "invited_at", UserEvent.invited_at,
+        "responded_at", UserEvent.responded_at,
+    )
+    return (
+        select(func.coalesce(
+            func.json_agg(aggregate_order_by(participant, UserEvent.invited_at, UserEvent.id)),
+            literal_column("'[]'::json"),
+            type_=JSON
+        ))
+        .join(User, User.id == UserEvent.user_id)
+        .where(UserEvent.event_id == event_id)
+        .scalar_subquery()
     )
 
-    if start_date:
-        query = query.where(Event.start_time >= start_date)
-    if end_date:
-        query = query.where(Event.end_time <= end_date)
 
-    query = query.offset(skip).limit(limit).order_by(Event.start_time)
+async def get_user_events(
+    db: AsyncSession,
+    user_id: str,
+    skip: int = 0,
+    limit: int = 100,
+    start_date: Optional[datetime.datetime] = None,
+    end_date: Optional[datetime.datetime] = None,
+    after: Optional[EventCursor] = None,
+    strategy: Optional[str] = None,
+    overlap: bool = False,
+) -> list[EventResponse]:
+    # Projection instead of ORM entities: the page is selected with only the
+    # EventResponse columns and each event's participants arrive as one JSON
+    # array, so no Event/UserEvent/User objects (or password hashes) are built.
+    page = user_events_query(
+        user_id, skip=skip, limit=limit, start_date=start_date,
+        end_date=end_date, after=after, strategy=strategy, overlap=overlap
+    ).with_only_columns(*EVENT_RESPONSE_COLUMNS).subquery()
 
-    result = await db.execute(query)
-    return result.scalars().all()
+    result = await db.execute(
+        select(page, _participants_json(page.c.id).label("participants"))
+        .order_by(page.c.start_time, page.c.id)
+    )
+    return [EventResponse.model_validate(row) for row in result.mappings()]
 
 
 async def update_event(
-    db: AsyncSession, event_id: str, event_update: EventUpdate
-) -> Optional[Event]:
-    result = await db.execute(select(Event).where(Event.id == event_id))
-    db_event = result.scalar_one_or_none()
-
-    if not db_event:
-        return None
-
+    db: AsyncSession, db_event: Event, event_update: EventUpdate
+) -> ParticipantChanges:
+    """Applies `event_update` to an event loaded by get_event_by_id. The
+    instance (including its participants) is up to date afterwards, so no
+    refresh is needed."""
     update_data = event_update.model_dump(exclude_unset=True)
     participant_emails = update_data.pop('participant_emails', None)
 
     for field, value in update_data.items():
         setattr(db_event, field, value)
 
+    changes = ParticipantChanges(added=set(), removed=set())
     if participant_emails is not None:
-        await update_event_participants(db, event_id, participant_emails)
+        changes = await update_event_participants(db, db_event, participant_emails)
 
     await db.commit()
-    await db.refresh(db_event)
-    return db_event
+    await event_cache.invalidate(db_event.id)
+    return changes
 
 
 async def delete_event(db: AsyncSession, event_id: str) -> bool:
@@ -97,6 +222,7 @@ async def delete_event(db: AsyncSession, event_id: str) -> bool:
 
     await db.delete(db_event)
     await db.commit()
+    await event_cache.invalidate(event_id)
     return True
 
 
@@ -107,28 +233,54 @@ async def add_event_participant(
         user_id=user_id, event_id=event_id, status="invited")
     db.add(db_user_event)
     await db.commit()
-    await db.refresh(db_user_event)
+    await event_cache.invalidate(event_id)
     return db_user_event
 
 
+async def add_event_participants(
+    db: AsyncSession, event_id: str, users: Iterable[User]
+) -> list[UserEvent]:
+    """Invite many users with a single INSERT ... ON CONFLICT DO NOTHING and
+    return the rows that were actually inserted (existing participants are
+    skipped), with `user` already populated.
+    Does not commit; the caller owns the transaction."""
+    users_by_id = {user.id: user for user in users}
+    if not users_by_id:
+        return []
+
+    invited_at = utc_now()
+    result = await db.scalars(
+        pg_insert(UserEvent)
+        .values([{
+            "id": generate_ulid(),
+            "user_id": user_id,
+            "event_id": event_id,
+            "status": "invited",
+            "invited_at": invited_at,
+        } for user_id in users_by_id])
+        .on_conflict_do_nothing(index_elements=[UserEvent.user_id, UserEvent.event_id])
+        .returning(UserEvent)
+    )
+    participants = list(result.all())
+    for participant in participants:
+        set_committed_value(participant, "user", users_by_id[participant.user_id])
+    return participants
+
+
 async def update_event_participation(
     db: AsyncSession, event_id: str, user_id: str, status: str
 ) -> Optional[UserEvent]:
-    result = await db.execute(
-        select(UserEvent).where(
-            and_(UserEvent.event_id == event_id, UserEvent.user_id == user_id)
-        )
+    result = await db.scalars(
+        update(UserEvent)
+        .where(and_(UserEvent.event_id == event_id, UserEvent.user_id == user_id))
+        .values(status=status, responded_at=utc_now())
+        .returning(UserEvent)
     )
-    db_user_event = result.scalar_one_or_none()
-
-    if not db_user_event:
-        return None
-
-    db_user_event.status = status
-    db_user_event.responded_at = datetime.datetime.now(datetime.timezone.utc)
+    db_user_event = result.one_or_none()
 
     await db.commit()
-    await db.refresh(db_user_event)
+    if db_user_event:
+        await event_cache.invalidate(event_id)
     return db_user_event
 
 
@@ -144,33 +296,28 @@ async def get_user_participation(
 
 
 async def update_event_participants(
-    db: AsyncSession, event_id: str, participant_emails: list[str]
-) -> None:
+    db: AsyncSession, db_event: Event, participant_emails: list[str]
+) -> ParticipantChanges:
+    """Replaces the event's participants with the users behind
+    `participant_emails` using one bulk DELETE and one bulk INSERT, and
+    updates the loaded participants collection to match.
+    Does not commit; the caller owns the transaction."""
+    users = await get_users_by_emails(db, participant_emails)
+    user_ids = [user.id for user in users]
+
     result = await db.execute(
-        select(UserEvent).where(UserEvent.event_id == event_id)
+        delete(UserEvent)
+        .where(
+            UserEvent.event_id == db_event.id,
+            UserEvent.user_id != all_(bindparam("user_ids", user_ids, type_=ARRAY(String)))
+        )
+        .returning(UserEvent.user_id)
     )
-    current_participant_users = result.scalars().all()
-    current_user_ids = {p.user_id for p in current_participant_users}
+    removed = set(result.scalars().all())
+    inserted = await add_event_participants(db, event_id=db_event.id, users=users)
 
-    users = await asyncio.gather(
-        *(get_user_by_email(db, email=email) for email in participant_emails)
-    )
-    new_user_ids = {u.id for u in [user for user in users if user]}
-
-    users_to_remove = current_user_ids - new_user_ids
-    users_to_add = new_user_ids - current_user_ids
-
-    if users_to_remove:
-        await db.execute(
-            delete(UserEvent).where(
-                and_(
-                    UserEvent.event_id == event_id,
-                    UserEvent.user_id.in_(users_to_remove)
-                )
-            )
-        )
+    set_committed_value(db_event, "participants", [
+        p for p in db_event.participants if p.user_id not in removed
+    ] + inserted)
 
-    await asyncio.gather(
-        *(add_event_participant(db, event_id=event_id, user_id=user_id)
-          for user_id in users_to_add)
-    )
+    return ParticipantChanges(added={p.user_id for p in inserted}, removed=removed)
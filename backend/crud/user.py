@@ -1,9 +1,10 @@
-from typing import Optional
+from typing import Iterable, Optional, Sequence
 
 from core.password import get_password_hash, verify_password
 from models.user import User
 from schemas.user import UserCreate
-from sqlalchemy import select
+from sqlalchemy import String, any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -17,13 +18,22 @@ async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
     return result.scalar_one_or_none()
 
 
+async def get_users_by_emails(db: AsyncSession, emails: Iterable[str]) -> Sequence[User]:
+    result = await db.execute(
+        select(User).where(
+            User.email == any_(bindparam("emails", list(emails), type_=ARRAY(String)))
+        )
+    )
+    return result.scalars().all()
+
+
 async def get_user_by_username(db: AsyncSession, username: str) -> Optional[User]:
     result = await db.execute(select(User).where(User.username == username))
     return result.scalar_one_or_none()
 
 
 async def create_user(db: AsyncSession, user: UserCreate) -> User:
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash(user.password)
     db_user = User(
         email=user.email,
         username=user.username,
@@ -41,6 +51,10 @@ async def authenticate_user(db: AsyncSession, email: str, password: str) -> Opti
     user = await get_user_by_email(db, email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    is_valid, new_hash = await verify_password(password, user.hashed_password)
+    if not is_valid:
         return None
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
     return user
@@ -0,0 +1,28 @@
+import asyncio
+
+from core.database import engine
+from sqlalchemy import text
+
+STATEMENTS = (
+    """
+    ALTER TABLE events
+    ADD COLUMN IF NOT EXISTS time_range tstzrange
+    GENERATED ALWAYS AS (tstzrange(start_time, end_time, '[)')) STORED
+    """,
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_events_time_range
+    ON events USING gist (time_range)
+    """,
+)
+
+
+async def add_event_time_range():
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for statement in STATEMENTS:
+            await conn.execute(text(statement))
+    print("Event time_range column and GiST index created successfully!")
+
+
+if __name__ == "__main__":
+    asyncio.run(add_event_time_range())
@@ -3,7 +3,8 @@ from typing import Optional
 
 from core.database import Base
 from core.utils import generate_ulid, utc_now
-from sqlalchemy import DateTime, ForeignKey, Index, String, Text
+from sqlalchemy import Computed, DateTime, ForeignKey, Index, String, Text
+from sqlalchemy.dialects.postgresql import TSTZRANGE, Range
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 
@@ -18,6 +19,9 @@ class Event(Base):
         DateTime(timezone=True), nullable=False)
     end_time: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False)
+    time_range: Mapped[Range[datetime]] = mapped_column(
+        TSTZRANGE, Computed("tstzrange(start_time, end_time, '[)')", persisted=True),
+        deferred=True)
     location: Mapped[Optional[str]] = mapped_column(String)
     creator_id: Mapped[str] = mapped_column(
         String, ForeignKey("users.id"), nullable=False)
@@ -33,5 +37,6 @@ class Event(Base):
     __table_args__ = (
         Index('ix_events_creator_start_time', 'creator_id', 'start_time'),
         Index('ix_events_start_end_time', 'start_time', 'end_time'),
+        Index('ix_events_time_range', 'time_range', postgresql_using='gist'),
         Index('ix_events_title_creator', 'title', 'creator_id'),
     )
@@ -1,9 +1,15 @@
 import asyncio
+from collections import deque
 from enum import Enum
-from typing import Dict, TypedDict
+from typing import Deque, Dict, List, NamedTuple, Optional, Set
 
+from core.config import settings
+from core.event_cache import event_cache
 from core.logger import root_logger
+from core.utils import generate_ulid, json_dumps
 from schemas.event import EventResponse
+from services.sse_broker import BrokerMessage, SSEBroker, create_sse_broker
+from services.sse_event_log import create_sse_event_log
 
 
 class SSEEventType(str, Enum):
@@ -14,44 +20,340 @@ class SSEEventType(str, Enum):
     EVENT_DELETED = "event_deleted"
 
 
-class SSEEventMessage(TypedDict):
+class SSEFrame(NamedTuple):
+    """A fully encoded `data:` frame, built once per notification and shared
+    by every connection it is delivered to."""
     type: SSEEventType
-    data: EventResponse
+    event_id: str
+    sequence: int
+    data: bytes
 
+    @classmethod
+    def from_payload(
+        cls, event_type: SSEEventType, event_id: str, sequence: int, payload: str
+    ) -> "SSEFrame":
+        return cls(type=event_type, event_id=event_id, sequence=sequence,
+                   data=encode_frame(sequence, payload))
 
-active_connections: Dict[str, asyncio.Queue[SSEEventMessage]] = {}
 
+def encode_frame(sequence: int, payload: str) -> bytes:
+    return b"id: %d\ndata: %s\n\n" % (sequence, payload.encode())
 
-def add_connection(user_id: str, connection_queue: asyncio.Queue[SSEEventMessage]) -> None:
-    active_connections[user_id] = connection_queue
-    root_logger.info("SSE connection added", extra={
-                     "user_id": user_id, "total_connections": len(active_connections)})
 
+CONNECTED_FRAME = b"data: " + \
+    json_dumps({"type": SSEEventType.CONNECTED.value}) + b"\n\n"
+KEEPALIVE_FRAME = b":keepalive\n\n"
 
-def remove_connection(user_id: str) -> None:
-    if user_id in active_connections:
-        del active_connections[user_id]
-    root_logger.info("SSE connection removed", extra={
-                     "user_id": user_id})
 
+class SSEOverflowPolicy(str, Enum):
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+    DISCONNECT = "disconnect"
 
-async def send_event_notification(event_type: SSEEventType, event_data: EventResponse, user_ids: set[str]) -> None:
-    if not active_connections or not user_ids:
-        return
 
-    message = SSEEventMessage(
-        type=event_type,
-        data=event_data
-    )
+class SSEConnection:
+    """A single browser tab. Holds at most `maxsize` undelivered messages and
+    applies the overflow policy when a slow client falls behind."""
 
-    for user_id in user_ids:
-        if user_id in active_connections:
+    def __init__(self, user_id: str, maxsize: int, overflow_policy: SSEOverflowPolicy):
+        self.id = generate_ulid()
+        self.user_id = user_id
+        self.maxsize = maxsize
+        self.overflow_policy = overflow_policy
+        self.dropped = 0
+        self.closed = False
+        self.replayed: Set[int] = set()
+        self._keepalive = False
+        self._messages: Deque[SSEFrame] = deque()
+        self._ready = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def offer(self, message: SSEFrame) -> bool:
+        """Queue a message without blocking. Returns False when the
+        connection had to be closed because of the overflow policy."""
+        if self.closed:
+            return False
+
+        if len(self._messages) >= self.maxsize:
+            if self.overflow_policy == SSEOverflowPolicy.DISCONNECT:
+                self.close()
+                return False
+            if not (self.overflow_policy == SSEOverflowPolicy.COALESCE and
+                    self._coalesce(message)):
+                self._messages.popleft()
+                self.dropped += 1
+                self._messages.append(message)
+            self._ready.set()
+            return True
+
+        self._messages.append(message)
+        self._ready.set()
+        return True
+
+    def _coalesce(self, message: SSEFrame) -> bool:
+        for index, pending in enumerate(self._messages):
+            if pending.event_id == message.event_id:
+                self._messages[index] = message
+                self.dropped += 1
+                return True
+        return False
+
+    async def get(self) -> Optional[bytes]:
+        """Wait for the next frame to write. Returns a keepalive comment when
+        the heartbeat fired and nothing else is pending, and None once the
+        connection is closed."""
+        while True:
+            if self.closed:
+                return None
+            if self._messages:
+                frame = self._messages.popleft()
+                if frame.sequence in self.replayed:
+                    self.replayed.discard(frame.sequence)
+                    continue
+                self._keepalive = False
+                return frame.data
+            if self._keepalive:
+                self._keepalive = False
+                return KEEPALIVE_FRAME
+            self._ready.clear()
+            await self._ready.wait()
+
+    def request_keepalive(self) -> None:
+        self._keepalive = True
+        self._ready.set()
+
+    def close(self) -> None:
+        self.closed = True
+        self._ready.set()
+
+
+class SSEConnectionRegistry:
+    def __init__(
+        self,
+        maxsize: int = settings.sse_queue_maxsize,
+        overflow_policy: SSEOverflowPolicy = SSEOverflowPolicy(
+            settings.sse_overflow_policy),
+    ):
+        self.maxsize = maxsize
+        self.overflow_policy = overflow_policy
+        self.connections: Dict[str, Dict[str, SSEConnection]] = {}
+        self.stats: Dict[str, int] = {
+            "messages_delivered": 0,
+            "messages_dropped": 0,
+            "connections_overflowed": 0,
+        }
+
+    @property
+    def connection_count(self) -> int:
+        return sum(len(user_connections) for user_connections in self.connections.values())
+
+    def has_user(self, user_id: str) -> bool:
+        return user_id in self.connections
+
+    def add(self, user_id: str) -> SSEConnection:
+        connection = SSEConnection(user_id, self.maxsize, self.overflow_policy)
+        self.connections.setdefault(user_id, {})[connection.id] = connection
+        root_logger.info("SSE connection added", extra={
+                         "user_id": user_id,
+                         "connection_id": connection.id,
+                         "total_connections": self.connection_count})
+        return connection
+
+    def remove(self, connection: SSEConnection) -> None:
+        connection.close()
+        user_connections = self.connections.get(connection.user_id)
+        if user_connections is None or user_connections.pop(connection.id, None) is None:
+            return
+        if not user_connections:
+            del self.connections[connection.user_id]
+        root_logger.info("SSE connection removed", extra={
+                         "user_id": connection.user_id,
+                         "connection_id": connection.id,
+                         "dropped_messages": connection.dropped})
+
+    def deliver(self, user_id: str, message: SSEFrame) -> None:
+        for connection in list(self.connections.get(user_id, {}).values()):
+            dropped_before = connection.dropped
+            if connection.offer(message):
+                self.stats["messages_delivered"] += 1
+            else:
+                self.stats["connections_overflowed"] += 1
+                root_logger.warning("SSE connection overflowed", extra={
+                                    "user_id": user_id,
+                                    "connection_id": connection.id})
+                self.remove(connection)
+            self.stats["messages_dropped"] += connection.dropped - dropped_before
+
+    def keepalive(self) -> None:
+        for user_connections in self.connections.values():
+            for connection in user_connections.values():
+                connection.request_keepalive()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            **self.stats,
+            "users": len(self.connections),
+            "connections": self.connection_count,
+        }
+
+
+sse_connections = SSEConnectionRegistry()
+
+
+class SSEBrokerConsumer:
+    """Runs the single per-process task that reads the broker and fans
+    messages out to the connections held by this worker."""
+
+    def __init__(self, broker: SSEBroker):
+        self.broker = broker
+        self.task: Optional[asyncio.Task[None]] = None
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self.task = asyncio.create_task(self._consume())
+        root_logger.info("SSE broker consumer started", extra={
+                         "broker": type(self.broker).__name__})
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        await self.broker.close()
+
+    async def _consume(self) -> None:
+        while True:
             try:
-                await active_connections[user_id].put(message)
+                async for message in self.broker.listen():
+                    await dispatch_local(message)
             except Exception as e:  # pylint: disable=broad-exception-caught
-                root_logger.error("Failed to send message to user",
-                                  extra={"user_id": user_id, "error": str(e)})
-                remove_connection(user_id)
+                root_logger.error("SSE broker consumer failed",
+                                  extra={"error": str(e)})
+                await asyncio.sleep(settings.sse_broker_retry_seconds)
+
+
+sse_broker_consumer = SSEBrokerConsumer(create_sse_broker())
+
+
+class SSEHeartbeat:
+    """One timer per process that asks every open connection to emit a
+    keepalive comment, instead of each stream waking up on its own."""
+
+    def __init__(self, registry: SSEConnectionRegistry, interval: float):
+        self.registry = registry
+        self.interval = interval
+        self.task: Optional[asyncio.Task[None]] = None
+
+    async def start(self) -> None:
+        if self.task is not None and not self.task.done():
+            return
+        self.task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self.registry.keepalive()
+
+
+sse_heartbeat = SSEHeartbeat(sse_connections, settings.sse_heartbeat_seconds)
+sse_event_log = create_sse_event_log()
+
+
+async def get_replay_frames(connection: SSEConnection, last_event_id: Optional[str]) -> List[bytes]:
+    """Frames the client missed since `last_event_id`. The connection skips
+    a live frame only if this replay already sent that exact sequence;
+    live frames can arrive out of sequence order, so there is no
+    high-water mark."""
+    if not last_event_id:
+        return []
+    try:
+        last_sequence = int(last_event_id)
+    except ValueError:
+        return []
+
+    entries = await sse_event_log.since(connection.user_id, last_sequence)
+    connection.replayed.update(sequence for sequence, _ in entries)
+    return [encode_frame(sequence, payload) for sequence, payload in entries]
+
+
+async def dispatch_local(message: BrokerMessage) -> None:
+    # Every worker's consumer sees every update, delete and response, so
+    # this doubles as the cross-worker event_cache invalidation.
+    await event_cache.invalidate(message["event_id"])
+
+    sequence = message["sequence"]
+    if sequence is None:
+        # Process-local log: every worker records what it receives, so a
+        # client reconnecting to any worker can be replayed.
+        sequence = await sse_event_log.next_id()
+        await sse_event_log.append(message["user_ids"], sequence, message["payload"])
+
+    user_ids = [user_id for user_id in message["user_ids"]
+                if sse_connections.has_user(user_id)]
+    if not user_ids:
+        return
+
+    frame = SSEFrame.from_payload(
+        SSEEventType(message["type"]), message["event_id"],
+        sequence, message["payload"])
+
+    for user_id in user_ids:
+        sse_connections.deliver(user_id, frame)
+
+
+async def send_event_notification(event_type: SSEEventType, event_data: EventResponse, user_ids: set[str]) -> None:
+    if not user_ids:
+        return
+
+    # The write that triggered this is already committed; a delivery
+    # failure must not turn its response into a 500.
+    try:
+        payload = json_dumps({
+            "type": event_type.value,
+            "data": event_data.model_dump(mode="json")
+        }).decode()
+        sequence = None
+        if sse_event_log.shared:
+            sequence = await sse_event_log.next_id()
+            await sse_event_log.append(user_ids, sequence, payload)
+
+        message: BrokerMessage = {
+            "type": event_type.value,
+            "event_id": event_data.id,
+            "sequence": sequence,
+            "payload": payload,
+            "user_ids": list(user_ids),
+        }
+
+        if sse_broker_consumer.running:
+            await sse_broker_consumer.broker.publish(message)
+        else:
+            await dispatch_local(message)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        root_logger.error("Failed to send event notification", extra={
+                          "event_type": event_type,
+                          "event_id": event_data.id,
+                          "error": str(e)})
+        return
 
     root_logger.info("Event sent", extra={
                      "event_type": event_type,
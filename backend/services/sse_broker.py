@@ -0,0 +1,103 @@
+import asyncio
+import json
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import redis.asyncio as redis
+from core.config import settings
+from core.utils import json_dumps
+
+BrokerMessage = Dict[str, Any]
+
+
+class SSEBroker(ABC):
+    @abstractmethod
+    async def publish(self, message: BrokerMessage) -> None:
+        ...
+
+    @abstractmethod
+    async def listen(self) -> AsyncIterator[BrokerMessage]:
+        yield ...
+
+    async def close(self) -> None:
+        return None
+
+
+class InMemorySSEBroker(SSEBroker):
+    """Process-local broker. Every listener receives every published message,
+    so several listeners on one instance behave like several workers sharing
+    a Redis stream."""
+
+    def __init__(self):
+        self._subscribers: List[asyncio.Queue[BrokerMessage]] = []
+
+    async def publish(self, message: BrokerMessage) -> None:
+        for subscriber in self._subscribers:
+            subscriber.put_nowait(message)
+
+    async def listen(self) -> AsyncIterator[BrokerMessage]:
+        subscriber: asyncio.Queue[BrokerMessage] = asyncio.Queue()
+        self._subscribers.append(subscriber)
+        try:
+            while True:
+                yield await subscriber.get()
+        finally:
+            self._subscribers.remove(subscriber)
+
+
+class RedisStreamsSSEBroker(SSEBroker):
+    """Publishes to a Redis stream and tails it from the newest entry, so
+    every worker process sees every notification exactly once. The last id
+    read is kept on the instance, so a listen() restarted after an error
+    resumes where it stopped instead of skipping to the newest entry."""
+
+    def __init__(
+        self,
+        client: Optional[redis.Redis] = None,
+        stream_name: str = settings.redis_stream_name,
+        maxlen: int = settings.sse_stream_maxlen,
+        block_ms: int = settings.sse_stream_block_ms,
+    ):
+        self.client = client or redis.Redis.from_url(
+            settings.redis_url,
+            encoding="utf-8",
+            decode_responses=True
+        )
+        self.stream_name = stream_name
+        self.maxlen = maxlen
+        self.block_ms = block_ms
+        self.last_id = "$"  # resolved to a concrete id by the first listen()
+
+    async def publish(self, message: BrokerMessage) -> None:
+        await self.client.xadd(
+            self.stream_name,
+            {"payload": json_dumps(message)},
+            maxlen=self.maxlen,
+            approximate=True
+        )
+
+    async def _resolve_last_id(self) -> str:
+        # "$" is re-evaluated by every XREAD, so entries added between two
+        # blocking reads would be skipped; pin the current tail once instead.
+        entries = await self.client.xrevrange(self.stream_name, "+", "-", count=1)
+        return entries[0][0] if entries else "0-0"
+
+    async def listen(self) -> AsyncIterator[BrokerMessage]:
+        if self.last_id == "$":
+            self.last_id = await self._resolve_last_id()
+        while True:
+            entries = await self.client.xread(
+                {self.stream_name: self.last_id}, block=self.block_ms, count=100)
+            for _, messages in entries:
+                for message_id, fields in messages:
+                    self.last_id = message_id
+                    yield json.loads(fields["payload"])
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def create_sse_broker() -> SSEBroker:
+    if settings.sse_broker == "redis":
+        return RedisStreamsSSEBroker()
+    return InMemorySSEBroker()
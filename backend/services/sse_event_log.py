@@ -0,0 +1,138 @@
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from typing import Deque, Iterable, List, Optional, Tuple
+
+import redis.asyncio as redis
+from core.config import settings
+from core.logger import root_logger
+
+EventLogEntry = Tuple[int, str]
+
+
+class SSEEventLog(ABC):
+    """Bounded per-user history of encoded notifications, used to replay
+    what a client missed when it reconnects with Last-Event-ID.
+
+    A `shared` log is written once by the sending worker and numbers
+    notifications globally. Otherwise every worker appends what it receives
+    from the broker and numbers it itself, so ids are only meaningful to the
+    worker that issued them."""
+
+    shared = False
+
+    @abstractmethod
+    async def next_id(self) -> int:
+        ...
+
+    @abstractmethod
+    async def append(self, user_ids: Iterable[str], sequence: int, payload: str) -> None:
+        ...
+
+    @abstractmethod
+    async def since(self, user_id: str, last_sequence: int) -> List[EventLogEntry]:
+        ...
+
+    async def close(self) -> None:
+        return None
+
+
+class InMemorySSEEventLog(SSEEventLog):
+    """Per-user deques kept in least-recently-appended order. A user's
+    history expires `ttl_seconds` after its last append, like the Redis
+    keys, and at most `max_users` histories are kept, so every recipient
+    ever notified does not stay in memory for the life of the process."""
+
+    def __init__(
+        self,
+        size: int = settings.sse_event_log_size,
+        ttl_seconds: int = settings.sse_event_log_ttl_seconds,
+        max_users: int = settings.sse_event_log_max_users,
+    ):
+        self.size = size
+        self.ttl_seconds = ttl_seconds
+        self.max_users = max_users
+        self._last_id = 0
+        self._entries: OrderedDict[str, Tuple[float, Deque[EventLogEntry]]] = OrderedDict()
+
+    async def next_id(self) -> int:
+        # Seeded from the clock so ids keep increasing across restarts.
+        self._last_id = max(self._last_id + 1, time.time_ns() // 1000)
+        return self._last_id
+
+    def _evict(self, now: float) -> None:
+        while self._entries:
+            user_id, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at > now and len(self._entries) <= self.max_users:
+                break
+            del self._entries[user_id]
+
+    async def append(self, user_ids: Iterable[str], sequence: int, payload: str) -> None:
+        now = time.monotonic()
+        for user_id in user_ids:
+            item = self._entries.pop(user_id, None)
+            entries = item[1] if item is not None else deque(maxlen=self.size)
+            entries.append((sequence, payload))
+            self._entries[user_id] = (now + self.ttl_seconds, entries)
+        self._evict(now)
+
+    async def since(self, user_id: str, last_sequence: int) -> List[EventLogEntry]:
+        item = self._entries.get(user_id)
+        if item is None or item[0] <= time.monotonic():
+            return []
+        return [entry for entry in item[1] if entry[0] > last_sequence]
+
+
+class RedisSSEEventLog(SSEEventLog):
+    shared = True
+
+    def __init__(
+        self,
+        client: Optional[redis.Redis] = None,
+        size: int = settings.sse_event_log_size,
+        ttl_seconds: int = settings.sse_event_log_ttl_seconds,
+    ):
+        self.client = client or redis.Redis.from_url(
+            settings.redis_url,
+            encoding="utf-8",
+            decode_responses=True
+        )
+        self.key_prefix = "sse_log"
+        self.size = size
+        self.ttl_seconds = ttl_seconds
+
+    def _get_key(self, user_id: str) -> str:
+        return f"{self.key_prefix}:{user_id}"
+
+    async def next_id(self) -> int:
+        return await self.client.incr(f"{self.key_prefix}:sequence")
+
+    async def append(self, user_ids: Iterable[str], sequence: int, payload: str) -> None:
+        entry = json.dumps([sequence, payload])
+        async with self.client.pipeline(transaction=False) as pipe:
+            for user_id in user_ids:
+                key = self._get_key(user_id)
+                pipe.rpush(key, entry)
+                pipe.ltrim(key, -self.size, -1)
+                pipe.expire(key, self.ttl_seconds)
+            await pipe.execute()
+
+    async def since(self, user_id: str, last_sequence: int) -> List[EventLogEntry]:
+        entries = await self.client.lrange(self._get_key(user_id), 0, -1)
+        return [(sequence, payload) for sequence, payload in map(json.loads, entries)
+                if sequence > last_sequence]
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def create_sse_event_log() -> SSEEventLog:
+    if settings.sse_event_log == "redis":
+        return RedisSSEEventLog()
+    if settings.sse_broker == "redis":
+        root_logger.warning(
+            "SSE_EVENT_LOG=memory with SSE_BROKER=redis: Last-Event-ID ids are "
+            "per worker, so a client that reconnects to another worker may miss "
+            "or repeat notifications; set SSE_EVENT_LOG=redis")
+    return InMemorySSEEventLog()
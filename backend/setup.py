@@ -26,6 +26,11 @@ dev_requires = [
     "pylint==3.3.2",
 ]
 
+speedups_requires = [
+    "orjson==3.10.12",
+    "PyJWT==2.10.1",
+]
+
 setup(
     name="calendar-api",
     version="1.0.0",
@@ -35,5 +40,6 @@ setup(
     install_requires=install_requires,
     extras_require={
         "dev": dev_requires,
+        "speedups": speedups_requires,
     },
 )
@@ -87,7 +87,10 @@ export default function WeeklyEvents() {
 
   useEffect(() => {
     const abortController = new AbortController();
-    const client = new SSEClient('/sse/events', authService.getApi(), abortController);
+    const client = new SSEClient('/sse/events', authService.getApi(), abortController, () => {
+      setAppState({ sseConnection: false });
+      showError('Connection lost. Reconnecting...');
+    });
 
     const run = async() => {
       try {
@@ -24,7 +24,7 @@ export class EventService {
     try {
       this.handleAbort();
       const response = await this.api.get(
-        `/events/?start_date=${startDate}&end_date=${endDate}`,
+        `/events/?start_date=${startDate}&end_date=${endDate}&overlap=true`,
         {
           signal: this.currentAbortController?.signal,
         });
@@ -1,10 +1,14 @@
 import type { AxiosProgressEvent, AxiosInstance } from 'axios';
 import type { SSEEvent } from '../types';
+import logger from '../utils/logger';
+
+const INITIAL_RETRY_MS = 1000;
+const MAX_RETRY_MS = 30000;
 
 export class SSEClient implements AsyncIterable<SSEEvent> {
-  private messageHandler!: (msg: SSEEvent) => void;
+  private messages: SSEEvent[] = [];
 
-  private errorHandler!: (error: Error) => void;
+  private waiting?: (result: IteratorResult<SSEEvent>) => void;
 
   private api: AxiosInstance;
 
@@ -12,12 +16,21 @@ export class SSEClient implements AsyncIterable<SSEEvent> {
 
   private controller: AbortController;
 
+  private onReconnecting?: () => void;
+
   private connected: boolean = false;
 
-  constructor(url: string, api: AxiosInstance, controller: AbortController) {
+  private closed: boolean = false;
+
+  private lastEventId?: string;
+
+  private retryMs: number = INITIAL_RETRY_MS;
+
+  constructor(url: string, api: AxiosInstance, controller: AbortController, onReconnecting?: () => void) {
     this.api = api;
     this.controller = controller;
     this.url = url;
+    this.onReconnecting = onReconnecting;
   }
 
   public isConnected(): boolean {
@@ -25,58 +38,106 @@ export class SSEClient implements AsyncIterable<SSEEvent> {
   }
 
   private connect() {
+    // Offset of the first frame not yet handled; one progress event can
+    // carry several frames (e.g. the replay burst after reconnecting).
+    let processed = 0;
+
     this.api.get(this.url, {
       signal: this.controller.signal,
       headers: {
         'Accept': 'text/event-stream',
         'Cache-Control': 'no-cache',
+        ...(this.lastEventId ? { 'Last-Event-ID': this.lastEventId } : {}),
       },
       onDownloadProgress: (progressEvent: AxiosProgressEvent) => {
         this.connected = true;
+        this.retryMs = INITIAL_RETRY_MS;
         const { responseText } = progressEvent.event.target;
 
-        const lastDoubleNewline = responseText.lastIndexOf('\n\n');
+        const end = responseText.lastIndexOf('\n\n');
 
-        if (lastDoubleNewline === -1) return;
+        if (end < processed) return;
 
-        const prevDoubleNewline = responseText.lastIndexOf('\n\n', lastDoubleNewline - 1);
-        const start = prevDoubleNewline === -1 ? 0 : prevDoubleNewline + 2;
-        const message = responseText.substring(start, lastDoubleNewline);
+        for (const frame of responseText.substring(processed, end).split('\n\n')) {
+          this.handleFrame(frame);
+        }
+        processed = end + 2;
+      },
+    })
+      .then(() => this.reconnect())
+      .catch(err => this.reconnect(err));
+  }
 
-        if (message.startsWith('data: ')) {
-          const data = message.slice(6).trim();
+  private handleFrame(frame: string) {
+    let data = '';
 
-          if (data) {
-            try {
-              const parsed = JSON.parse(data);
+    for (const line of frame.split('\n')) {
+      if (line.startsWith('id: ')) {
+        this.lastEventId = line.slice(4).trim();
+      } else if (line.startsWith('data: ')) {
+        data += line.slice(6).trim();
+      }
+    }
 
-              queueMicrotask(() => this.messageHandler(parsed));
-            } catch (err) {
-              queueMicrotask(() => this.errorHandler(new Error(`Failed to parse SSE message: ${err}`)));
-            }
-          }
-        }
-      },
-    }).catch(err => {
-      this.connected = false;
-      queueMicrotask(() => this.errorHandler(err));
-    });
+    if (!data) return;
+
+    try {
+      this.push(JSON.parse(data));
+    } catch (error) {
+      logger.error({ message: 'Failed to parse SSE message', error });
+    }
+  }
+
+  private push(message: SSEEvent) {
+    if (this.waiting) {
+      const resolve = this.waiting;
+      this.waiting = undefined;
+      resolve({ value: message, done: false });
+    } else {
+      this.messages.push(message);
+    }
+  }
+
+  private reconnect(error?: unknown) {
+    const wasConnected = this.connected;
+    this.connected = false;
+
+    if (this.closed || this.controller.signal.aborted) return;
+
+    if (error) {
+      logger.warn({ message: 'SSE connection failed', error, retryMs: this.retryMs });
+    }
+    if (wasConnected) {
+      this.onReconnecting?.();
+    }
+
+    // Resumes from lastEventId, so the server replays what was missed.
+    setTimeout(() => {
+      if (!this.closed) this.connect();
+    }, this.retryMs);
+    this.retryMs = Math.min(this.retryMs * 2, MAX_RETRY_MS);
   }
 
   public disconnect() {
     this.connected = false;
+    this.closed = true;
     this.controller.abort();
+    this.waiting?.({ value: undefined, done: true });
+    this.waiting = undefined;
   }
 
   public [Symbol.asyncIterator](): AsyncIterator<SSEEvent> {
     this.connect();
 
     return {
-      next: () =>
-        new Promise((resolve, reject) => {
-          this.messageHandler = (msg) => resolve({ value: msg, done: false });
-          this.errorHandler = (error) => reject(error);
-        }),
+      next: () => {
+        const message = this.messages.shift();
+        if (message) return Promise.resolve({ value: message, done: false });
+        if (this.closed) return Promise.resolve({ value: undefined, done: true });
+        return new Promise((resolve) => {
+          this.waiting = resolve;
+        });
+      },
     };
   }
 }